@@ -4,6 +4,7 @@ const cors = require('cors');
 const bcrypt = require('bcryptjs');
 const jwt = require('jsonwebtoken');
 const { createProxyMiddleware } = require('http-proxy-middleware');
+const http = require('http');
 const dotenv = require('dotenv');
 // Try loading .env.node first for explicit separation
 const fs = require('fs');
@@ -15,6 +16,7 @@ const PORT = process.env.PORT || 5000;
 const MONGO_URI = process.env.MONGO_URI || 'mongodb://127.0.0.1:27017/soundroutine';
 const JWT_SECRET = process.env.JWT_SECRET || 'soundroutine_secret_key';
 const MODEL_BASE_URL = process.env.MODEL_BASE_URL || 'http://127.0.0.1:8001';
+const MONGO_MAX_POOL = parseInt(process.env.MONGO_MAX_POOL || '64', 10);
 
 // Middleware
 app.use(cors({
@@ -23,9 +25,14 @@ app.use(cors({
     methods: ['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'],
     allowedHeaders: ['Content-Type', 'Authorization']
 }));
+// Keep-alive pool to Flask: without an agent http-proxy sends `Connection: close`
+// and every proxied poll opens a fresh TCP connection
+const modelAgent = new http.Agent({ keepAlive: true, keepAliveMsecs: 30000, maxSockets: 64 });
+
 app.use('/api', createProxyMiddleware({
     target: MODEL_BASE_URL,
     changeOrigin: true,
+    agent: modelAgent,
     proxyTimeout: 300000,
     timeout: 300000,
     onProxyReq: (proxyReq, req, res) => {
@@ -40,15 +47,24 @@ app.use('/api', createProxyMiddleware({
 }));
 app.use(express.json());
 
-// MongoDB Connection
-mongoose.connect(MONGO_URI)
-    .then(() => console.log('✅ MongoDB Connected'))
-    .catch(err => console.error('❌ MongoDB Connection Error:', err));
-
 // --- User Models ---
 const UserAuth = require('./models/UserAuth');
 const UserInfo = require('./models/UserInfo');
 
+// MongoDB Connection (프로세스 전체에서 하나의 커넥션 풀을 공유)
+mongoose.connect(MONGO_URI, {
+    maxPoolSize: MONGO_MAX_POOL,
+    minPoolSize: 2,
+    retryWrites: true,
+})
+    .then(() => {
+        console.log('✅ MongoDB Connected');
+        // id unique 인덱스를 시작 시점에 확실히 만들어 둠 (login/register의 id 조회가 COLLSCAN 되지 않도록)
+        return Promise.all([UserAuth.init(), UserInfo.init()]);
+    })
+    .then(() => console.log('✅ MongoDB indexes ready'))
+    .catch(err => console.error('❌ MongoDB Connection Error:', err));
+
 // --- Routes ---
 
 // Register
@@ -62,24 +78,26 @@ app.post('/auth/register', async (req, res) => {
             return res.status(400).json({ message: 'All fields are required' });
         }
 
-        // 1. Check if user already exists in Auth
-        const existingUser = await UserAuth.findOne({ id });
-        if (existingUser) {
-            console.log('⚠️ User already exists:', id);
-            return res.status(400).json({ message: 'User ID already exists' });
-        }
-
-        // 2. Hash password
+        // 1. Hash password
         const hashedPassword = await bcrypt.hash(password, 10);
 
-        // 3. Create UserAuth (Login credentials)
+        // 2. Create UserAuth (Login credentials)
+        // 중복 검사는 별도 exists() 조회 대신 id unique 인덱스에 맡김 (insert 한 번으로 판정)
         const newUserAuth = new UserAuth({
             id,
             password: hashedPassword
         });
-        await newUserAuth.save();
+        try {
+            await newUserAuth.save();
+        } catch (err) {
+            if (err.code === 11000) {
+                console.log('⚠️ User already exists:', id);
+                return res.status(400).json({ message: 'User ID already exists' });
+            }
+            throw err;
+        }
 
-        // 4. Create UserInfo (Profile details)
+        // 3. Create UserInfo (Profile details)
         const newUserInfo = new UserInfo({
             id,
             name,
@@ -100,8 +118,11 @@ app.post('/auth/login', async (req, res) => {
     try {
         const { id, password } = req.body;
 
-        // 1. Find Auth Info
-        const userAuth = await UserAuth.findOne({ id });
+        // 1. Find Auth Info + User Info (Name, Job) in parallel (one round-trip of latency)
+        const [userAuth, userInfo] = await Promise.all([
+            UserAuth.findOne({ id }).select('id password').lean(),
+            UserInfo.findOne({ id }).select('name job').lean(),
+        ]);
         if (!userAuth) {
             return res.status(400).json({ message: 'Invalid credentials' });
         }
@@ -112,10 +133,7 @@ app.post('/auth/login', async (req, res) => {
             return res.status(400).json({ message: 'Invalid credentials' });
         }
 
-        // 3. Find User Info (Name, Job)
-        const userInfo = await UserInfo.findOne({ id });
-
-        // 4. Create Token
+        // 3. Create Token
         const token = jwt.sign({ id: userAuth.id }, JWT_SECRET, { expiresIn: '1h' });
 
         res.json({
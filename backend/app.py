@@ -2,39 +2,90 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from flask import Flask
 from flask_cors import CORS
+from flask_compress import Compress
+from werkzeug.exceptions import RequestEntityTooLarge
 
-from services.job_manager import JobManager
+from json_provider import ORJSONProvider
+
+from services.job_manager import JobManager, JobQueueFull
 from services.state_manager import StateManager
 from services.pipeline_service import PipelineService
 from services.audio_service import AudioService
+from services.uploads import UploadRequest
 
-from routes.health import health_bp
+from routes.health import health_bp, HealthMiddleware
 from routes.beats import beats_bp
 from routes.legacy import legacy_bp
+from routes.parsing import parse_bool
+from routes.limits import enforce_body_limit, handle_job_queue_full, handle_too_large
+
+
+@lru_cache(maxsize=1)
+def load_config() -> dict:
+    """
+    Env/path config, computed once per process.
+    create_app() can be called again (tests, gunicorn preload) without re-reading env or re-creating dirs.
+    """
+    # ---- Paths (Project Root)
+    PROJECT_ROOT = Path(__file__).resolve().parents[1]  # .../soundroutine
+    DEFAULT_OUTS_DIR = PROJECT_ROOT / "outs"
+    # Large multipart file parts are spooled here (same filesystem as outs/, see UploadRequest)
+    UPLOAD_SPOOL_DIR = DEFAULT_OUTS_DIR / ".upload_spool"
+    UPLOAD_SPOOL_DIR.mkdir(parents=True, exist_ok=True)
+
+    return {
+        "PROJECT_ROOT": PROJECT_ROOT,
+        "DEFAULT_OUTS_DIR": DEFAULT_OUTS_DIR,
+        # Also set UPLOAD_FOLDER for compatibility with existing services if needed
+        "UPLOAD_FOLDER": str(DEFAULT_OUTS_DIR / "uploads"),  # Or wherever default is
+        "UPLOAD_SPOOL_DIR": str(UPLOAD_SPOOL_DIR),
+        # Reject oversized uploads before Werkzeug starts parsing the multipart body
+        "MAX_CONTENT_LENGTH": int(os.environ.get("MAX_UPLOAD_MB", "512")) * 1024 * 1024,
+        # Persisted JSON is compact unless explicitly asked for (debugging by hand)
+        "JSON_PRETTY": parse_bool(os.environ.get("SOUNDROUTINE_JSON_PRETTY")),
+        # Pipelines running at once; further jobs wait in the JobManager queue
+        "MAX_CONCURRENT_JOBS": int(os.environ.get("MAX_CONCURRENT_JOBS", "2")),
+        # Jobs allowed to wait for a worker; beyond that job submissions get 429
+        "MAX_QUEUED_JOBS": int(os.environ.get("MAX_QUEUED_JOBS", "8")),
+        # Behind a front server that honours X-Sendfile (Apache mod_xsendfile, lighttpd):
+        # send_file() answers with a header only and the server streams the audio itself
+        "USE_X_SENDFILE": parse_bool(os.environ.get("USE_X_SENDFILE")),
+    }
 
 
 def create_app() -> Flask:
     app = Flask(__name__)
+    app.request_class = UploadRequest
+    app.json = ORJSONProvider(app)
     CORS(app, resources={r"/*": {"origins": "*"}})
 
-    # ---- Paths (Project Root)
-    PROJECT_ROOT = Path(__file__).resolve().parents[1]  # .../soundroutine
-    
+    # state payloads (grid + events + pools) get large; audio mimetypes are left alone
+    app.config.update(
+        # zstd first: similar ratio to br on JSON at a fraction of the CPU; br/gzip for older clients
+        COMPRESS_ALGORITHM=["zstd", "br", "gzip"],
+        COMPRESS_MIN_SIZE=1024,
+        COMPRESS_LEVEL=4,
+        COMPRESS_BR_LEVEL=4,
+        COMPRESS_ZSTD_LEVEL=3,
+    )
+    Compress(app)
+
     # Store config
-    app.config["PROJECT_ROOT"] = PROJECT_ROOT
-    DEFAULT_OUTS_DIR = PROJECT_ROOT / "outs"
-    app.config["DEFAULT_OUTS_DIR"] = DEFAULT_OUTS_DIR
-    
-    # Also set UPLOAD_FOLDER for compatibility with existing services if needed
-    app.config["UPLOAD_FOLDER"] = str(DEFAULT_OUTS_DIR / "uploads") # Or wherever default is
+    app.config.update(load_config())
+    PROJECT_ROOT = app.config["PROJECT_ROOT"]
+    DEFAULT_OUTS_DIR = app.config["DEFAULT_OUTS_DIR"]
 
     # ---- Initialize Services
     # We attach them to 'app' instance so blueprints can access them via current_app
-    app.job_manager = JobManager()
-    app.state_manager = StateManager(outs_root=DEFAULT_OUTS_DIR)
+    app.job_manager = JobManager(
+        max_workers=app.config["MAX_CONCURRENT_JOBS"],
+        max_queued=app.config["MAX_QUEUED_JOBS"],
+    )
+    app.state_manager = StateManager(outs_root=DEFAULT_OUTS_DIR, pretty=app.config["JSON_PRETTY"])
     app.pipeline_service = PipelineService(
         project_root=PROJECT_ROOT, 
         state_manager=app.state_manager, 
@@ -45,15 +96,24 @@ def create_app() -> Flask:
         state_manager=app.state_manager
     )
 
+    # Per-view body caps (@limit_body) are checked before any body parsing
+    app.before_request(enforce_body_limit)
+    app.register_error_handler(RequestEntityTooLarge, handle_too_large)
+    app.register_error_handler(JobQueueFull, handle_job_queue_full)
+
     # ---- Register Blueprints
     app.register_blueprint(health_bp)
     app.register_blueprint(beats_bp)
     app.register_blueprint(legacy_bp)
 
+    # Health checks skip Flask dispatch entirely (services are attached above)
+    app.wsgi_app = HealthMiddleware(app.wsgi_app)
+
     return app
 
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", "5000"))
     app = create_app()
-    app.run(host="0.0.0.0", port=port, debug=True)
\ No newline at end of file
+    # Debug (reloader + debugger) is opt-in; it slows every request
+    app.run(host="0.0.0.0", port=port, debug=parse_bool(os.environ.get("FLASK_DEBUG")))
\ No newline at end of file
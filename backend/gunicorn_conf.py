@@ -0,0 +1,25 @@
+# backend/gunicorn_conf.py
+# Usage (from backend/):  gunicorn -c gunicorn_conf.py "app:create_app()"
+import os
+
+bind = os.environ.get("GUNICORN_BIND", f"0.0.0.0:{os.environ.get('PORT', '5000')}")
+
+# Job status (JobManager) and the state.json byte cache live in-process, and
+# /api/jobs/<id> polling must land on the process that started the job -> one worker.
+# Concurrency comes from threads: handlers mostly wait on disk or pipeline subprocesses.
+workers = int(os.environ.get("GUNICORN_WORKERS", "1"))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
+
+# Frontend polls state/job endpoints every few seconds through the node proxy; keep connections open
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", "30"))
+
+# Legacy synchronous /api/generate can run for minutes
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "600"))
+graceful_timeout = 30
+
+# send_file() responses go through wsgi.file_wrapper -> sendfile(2), no userspace copy of audio
+sendfile = True
+
+# Import app + services once in the master before forking
+preload_app = True
@@ -1,12 +1,23 @@
+import hashlib
 import os
 import uuid
-import json
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from flask import Blueprint, jsonify, request, send_file, current_app
+from flask import Blueprint, Response, jsonify, request, send_file, current_app
+
+from services.json_io import load_json_cached, save_json
+from services.frontend_events import to_frontend_events
+from services.uploads import fsync_dir, safe_upload_name, save_upload
+from routes.parsing import parse_bool, parse_float, parse_int
+from routes.limits import JSON_BODY_LIMIT, job_queue_full, limit_body
 
 beats_bp = Blueprint("beats", __name__)
 
+UPLOAD_SUFFIXES = frozenset({".wav", ".mp3", ".m4a", ".webm"})
+DOWNLOAD_KINDS = frozenset({"mp3", "wav", "flac", "ogg", "m4a"})
+SAMPLE_EXTS = (".wav", ".mp3", ".m4a", ".flac")
+
 # --- Helper accessors for services attached to app ---
 def get_state_manager():
     return current_app.state_manager
@@ -22,6 +33,7 @@ def get_audio_service():
 
 
 @beats_bp.post("/api/beats")
+@limit_body(JSON_BODY_LIMIT)
 def create_beat():
     """Creates a new beat (empty state)."""
     data = request.json or {}
@@ -56,32 +68,38 @@ def upload_files(beat_name: str):
     DEFAULT_OUTS_DIR = current_app.config["DEFAULT_OUTS_DIR"]
     upload_dir = DEFAULT_OUTS_DIR / beat_name / "uploads"
     upload_dir.mkdir(parents=True, exist_ok=True)
+    upload_dir_str = os.fspath(upload_dir)  # 파일마다 Path 객체를 만들지 않도록 str 경로로 join
 
     saved = []
     for f in files:
-        if not f.filename: continue
-        suffix = Path(f.filename).suffix.lower()
-        if suffix not in {".wav", ".mp3", ".m4a", ".webm"}:
+        name = safe_upload_name(f.filename)
+        if not name: continue
+        suffix = os.path.splitext(name)[1].lower()
+        if suffix not in UPLOAD_SUFFIXES:
             continue
         
-        out_path = upload_dir / Path(f.filename).name
-        f.save(out_path)
-        saved.append(str(out_path))
+        out_path = os.path.join(upload_dir_str, name)
+        save_upload(f, out_path)
+        # 클라이언트는 저장된 이름(name)으로 삭제 요청
+        saved.append({"name": name, "original_name": f.filename, "saved_path": out_path})
 
     if not saved:
         return jsonify({"ok": False, "error": "No valid files saved"}), 400
+    fsync_dir(upload_dir_str)
 
-    get_state_manager().update_state(beat_name, {"uploads_dir": str(upload_dir)})
-    return jsonify({"ok": True, "count": len(saved)})
+    get_state_manager().update_state(beat_name, {"uploads_dir": upload_dir_str})
+    return jsonify({"ok": True, "count": len(saved), "uploaded": saved})
 
 
 @beats_bp.delete("/api/beats/<beat_name>/files/<filename>")
 def delete_file(beat_name: str, filename: str):
     DEFAULT_OUTS_DIR = current_app.config["DEFAULT_OUTS_DIR"]
     upload_dir = DEFAULT_OUTS_DIR / beat_name / "uploads"
-    file_path = upload_dir / filename
+    # 업로드 때와 같은 규칙으로 정리 (경로 구분자/'..' 로 upload_dir 밖을 가리키지 못하게)
+    name = safe_upload_name(filename)
+    file_path = upload_dir / name
     
-    if file_path.exists() and file_path.is_file():
+    if name and file_path.is_file():
         try:
             file_path.unlink()
             return jsonify({"ok": True})
@@ -92,17 +110,22 @@ def delete_file(beat_name: str, filename: str):
 
 
 @beats_bp.post("/api/beats/<beat_name>/generate/initial")
+@limit_body(JSON_BODY_LIMIT)
 def generate_initial(beat_name: str):
     """Runs the full pipeline (1-6) as a job. Stage 7 is on-demand."""
+    # Refuse before renaming the project folder; otherwise the client retries with a stale name
+    if get_job_manager().is_full():
+        return job_queue_full()
+
     data = request.json or {}
     beat_title = str(data.get("beat_title", "")).strip()
     
     config = {
-        "bpm": float(data.get("bpm", 120.0)),
-        "seed": int(data.get("seed", 42)),
+        "bpm": parse_float(data.get("bpm"), 120.0),
+        "seed": parse_int(data.get("seed"), 42),
         "style": str(data.get("style", "rock")),
-        "progressive": bool(data.get("progressive", True)),
-        "repeat_full": int(data.get("repeat_full", 2)),
+        "progressive": parse_bool(data.get("progressive"), True),
+        "repeat_full": parse_int(data.get("repeat_full"), 2),
         "beat_title": beat_title,
     }
     
@@ -147,74 +170,103 @@ def generate_initial(beat_name: str):
     return jsonify({"ok": True, "job_id": job_id, "new_beat_name": new_beat_name})
 
 
+def _stat(path):
+    """os.stat or None (missing path / not set in state)."""
+    if not path:
+        return None
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=32)
+def _transform_events(path: str, mtime_ns: int, size: int, steps_per_bar: int) -> list:
+    # event_grid 파일이 바뀌지 않았으면 프론트용 변환 결과를 그대로 재사용 (반환 리스트는 수정 금지)
+    return to_frontend_events(load_json_cached(path), steps_per_bar)
+
+
+def _frontend_events(state: dict, event_path: str, event_st, steps_per_bar: int) -> list:
+    # 파이프라인이 미리 만들어 둔 파일이 이 event grid 것이면 그대로 사용, 아니면 여기서 변환
+    baked = state.get("frontend_events")
+    if baked and baked.get("source") == event_path and baked.get("steps_per_bar") == steps_per_bar:
+        baked_st = _stat(baked.get("path"))
+        if baked_st and baked_st.st_mtime_ns >= event_st.st_mtime_ns:
+            return load_json_cached(baked["path"], baked_st)
+    return _transform_events(event_path, event_st.st_mtime_ns, event_st.st_size, steps_per_bar)
+
+
+@lru_cache(maxsize=32)
+def _transform_pools(path: str, mtime_ns: int, size: int) -> dict:
+    raw_pools = load_json_cached(path)
+    transformed_pools = {}
+    for k, v in raw_pools.items():
+        if k.endswith("_POOL"):
+            role_name = k.replace("_POOL", "")
+            if isinstance(v, list):
+                transformed_pools[role_name] = [item.get("sample_id") for item in v if isinstance(item, dict)]
+    return transformed_pools
+
+
+def _state_etag(beat_name: str, state: dict, *stats) -> str:
+    # state.json은 StateManager만 쓰고 매번 updated_at을 갱신함 + 참조 파일들의 (mtime, size)
+    key = [beat_name, state.get("updated_at")]
+    key.extend((st.st_mtime_ns, st.st_size) if st else None for st in stats)
+    return hashlib.blake2b(repr(key).encode(), digest_size=12).hexdigest()
+
+
 @beats_bp.get("/api/beats/<beat_name>/state")
 def get_beat_state(beat_name: str):
     state = get_state_manager().get_state(beat_name)
+
+    grid_path = state.get("latest_grid_json")
+    event_path = state.get("latest_event_grid_json") or state.get("latest_editor_json")
+    pools_path = state.get("latest_pools_json")
+    grid_st, event_st, pools_st = _stat(grid_path), _stat(event_path), _stat(pools_path)
+
+    # 프론트가 job 동안 계속 폴링함: 아무 파일도 안 바뀌었으면 payload를 만들지 않고 304.
+    # weak ETag: flask-compress가 br/gzip 별로 strong ETag를 바꾸지 않도록
+    etag = _state_etag(beat_name, state, grid_st, event_st, pools_st)
+    if request.if_none_match.contains_weak(etag):
+        resp = Response(status=304)
+        resp.set_etag(etag, weak=True)
+        return resp
     
     # Inject Grid Content
-    grid_path = state.get("latest_grid_json")
-    if grid_path and os.path.exists(grid_path):
+    if grid_st:
         try:
-            with open(grid_path, "r") as f:
-                state["grid_content"] = json.load(f)
+            # cached object is shared: copy before injecting keys
+            state["grid_content"] = dict(load_json_cached(grid_path, grid_st))
             
             # Use audio service logic or duplicate logic here?
             # Logic for event transformation is complex view-logic. Keep here for now.
-            event_path = state.get("latest_event_grid_json") or state.get("latest_editor_json")
-            if event_path and os.path.exists(event_path):
-                 with open(event_path, "r") as f:
-                    events_data = json.load(f)
-                    raw_events = events_data if isinstance(events_data, list) else events_data.get("events", [])
+            if event_st:
+                steps_per_bar = state["grid_content"].get("steps_per_bar", 16)
+                # Fix keys
+                if "bars" not in state["grid_content"] and "num_bars" in state["grid_content"]:
+                    state["grid_content"]["bars"] = state["grid_content"]["num_bars"]
+                if "stepsPerBar" not in state["grid_content"]:
+                    state["grid_content"]["stepsPerBar"] = steps_per_bar
+
+                state["grid_content"]["events"] = _frontend_events(state, event_path, event_st, steps_per_bar)
                     
-                    steps_per_bar = state["grid_content"].get("steps_per_bar", 16)
-                    # Fix keys
-                    if "bars" not in state["grid_content"] and "num_bars" in state["grid_content"]:
-                        state["grid_content"]["bars"] = state["grid_content"]["num_bars"]
-                    if "stepsPerBar" not in state["grid_content"]:
-                        state["grid_content"]["stepsPerBar"] = steps_per_bar
-
-                    transformed_events = []
-                    for e in raw_events:
-                        abs_step = (e["bar"] * steps_per_bar + e["step"]) if "bar" in e else e["step"]
-                        vel = e.get("vel", e.get("velocity", 0.8))
-                        final_vel = int(vel * 127) if isinstance(vel, float) and vel <= 1.0 else int(vel)
-                        
-                        new_e = {
-                            "step": abs_step,
-                            "role": e["role"],
-                            "velocity": final_vel,
-                            "duration": e.get("dur_steps", e.get("duration", 1)),
-                            "sampleId": e.get("sample_id"),
-                            "offset": e.get("micro_offset_ms", 0)
-                        }
-                        transformed_events.append(new_e)
-
-                    state["grid_content"]["events"] = transformed_events
-                        
         except Exception as e:
             print(f"Error reading grid: {e}")
 
     # Inject Pools Content
-    pools_path = state.get("latest_pools_json")
-    if pools_path and os.path.exists(pools_path):
+    if pools_st:
         try:
-            with open(pools_path, "r") as f:
-                raw_pools = json.load(f)
-                transformed_pools = {}
-                for k, v in raw_pools.items():
-                    if k.endswith("_POOL"):
-                        role_name = k.replace("_POOL", "")
-                        if isinstance(v, list):
-                            transformed_pools[role_name] = [item.get("sample_id") for item in v if isinstance(item, dict)]
-                
-                state["pools_content"] = transformed_pools
+            state["pools_content"] = _transform_pools(pools_path, pools_st.st_mtime_ns, pools_st.st_size)
         except Exception as e:
             print(f"Error reading pools: {e}")
 
-    return jsonify({"ok": True, "state": state})
+    resp = jsonify({"ok": True, "state": state})
+    resp.set_etag(etag, weak=True)
+    return resp
 
 
 @beats_bp.patch("/api/beats/<beat_name>/config")
+@limit_body(JSON_BODY_LIMIT)
 def update_config(beat_name: str):
     data = request.json or {}
     state = get_state_manager().get_state(beat_name)
@@ -226,6 +278,7 @@ def update_config(beat_name: str):
 
 
 @beats_bp.patch("/api/beats/<beat_name>/roles")
+@limit_body(JSON_BODY_LIMIT)
 def save_roles(beat_name: str):
     """
     Saves user-modified role mappings.
@@ -268,7 +321,7 @@ def save_roles(beat_name: str):
             sample_path = None
             
             # Check if sample_name already has extension
-            if Path(sample_name).suffix in ['.wav', '.mp3', '.m4a', '.flac']:
+            if Path(sample_name).suffix in SAMPLE_EXTS:
                 # Try direct path
                 direct_path = samples_dir / sample_name
                 if direct_path.exists():
@@ -276,8 +329,8 @@ def save_roles(beat_name: str):
             
             if not sample_path:
                 # Try with common extensions
-                for ext in ['.wav', '.mp3', '.m4a', '.flac']:
-                    base_name = sample_name.rsplit('.', 1)[0] if '.' in sample_name else sample_name
+                base_name = sample_name.rsplit('.', 1)[0] if '.' in sample_name else sample_name
+                for ext in SAMPLE_EXTS:
                     try_path = samples_dir / f"{base_name}{ext}"
                     if try_path.exists():
                         sample_path = try_path
@@ -298,6 +351,15 @@ def save_roles(beat_name: str):
                 "role": role_key
             })
     
+    # Same mapping as the current pools (e.g. Save pressed twice): don't mint a new version
+    current_pools_path = state.get("latest_pools_json")
+    if current_pools_path and os.path.exists(current_pools_path):
+        try:
+            if load_json_cached(current_pools_path) == role_pools:
+                return jsonify({"ok": True, "pools_path": current_pools_path, "unchanged": True})
+        except Exception as e:
+            print(f"Error reading pools: {e}")
+
     # Save to 2_role directory with versioned filename
     role_dir = DEFAULT_OUTS_DIR / beat_name / "2_role"
     role_dir.mkdir(parents=True, exist_ok=True)
@@ -317,8 +379,8 @@ def save_roles(beat_name: str):
         next_ver = 1
     
     new_pools_path = role_dir / f"role_pools_{next_ver}.json"
-    with open(new_pools_path, "w", encoding="utf-8") as f:
-        json.dump(role_pools, f, ensure_ascii=False, indent=2)
+    pretty = current_app.config.get("JSON_PRETTY") or parse_bool(request.args.get("pretty"))
+    save_json(new_pools_path, role_pools, pretty=pretty)
     
     # Update state
     get_state_manager().update_state(beat_name, {"latest_pools_json": str(new_pools_path)})
@@ -327,9 +389,10 @@ def save_roles(beat_name: str):
 
 
 @beats_bp.post("/api/beats/<beat_name>/regenerate")
+@limit_body(JSON_BODY_LIMIT)
 def regenerate(beat_name: str):
     data = request.json or {}
-    from_stage = int(data.get("from_stage", 1))
+    from_stage = parse_int(data.get("from_stage"), 1)
     overrides = data.get("params", {}) 
 
     pipeline = get_pipeline_service()
@@ -347,12 +410,50 @@ def regenerate(beat_name: str):
 
 @beats_bp.get("/api/jobs/<job_id>")
 def get_job_status(job_id: str):
-    job = get_job_manager().get_job(job_id)
+    # ?wait=<sec>: long-poll, answer as soon as the job finishes (capped so proxies don't time out)
+    wait = min(parse_float(request.args.get("wait"), 0.0), 60.0)
+    if wait > 0:
+        job = get_job_manager().wait_done(job_id, timeout=wait)
+    else:
+        job = get_job_manager().get_job(job_id)
     if not job:
         return jsonify({"ok": False, "error": "Job not found"}), 404
     return jsonify({"ok": True, "job": job})
 
 
+@beats_bp.get("/api/jobs/<job_id>/events")
+def job_events(job_id: str):
+    """
+    Server-Sent Events stream of job progress (instead of polling /api/jobs/<job_id>).
+    Emits the job dict on every status/progress change and closes once it is no longer running.
+    """
+    job_manager = get_job_manager()
+    if not job_manager.get_job(job_id):
+        return jsonify({"ok": False, "error": "Job not found"}), 404
+
+    dumps = current_app.json.dumps  # generator runs after the app context is gone
+
+    def stream():
+        last = None
+        while True:
+            job = job_manager.wait_job(job_id, last, timeout=15.0)
+            if job is None:
+                return
+            if last is not None and job["status"] == last["status"] and job["progress"] == last["progress"]:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"data: {dumps(job)}\n\n"
+            last = job
+            if job["status"] != "running":
+                return
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @beats_bp.get("/api/beats/<beat_name>/latest")
 def latest(beat_name: str):
     try:
@@ -365,7 +466,7 @@ def latest(beat_name: str):
 @beats_bp.get("/api/beats/<beat_name>/download")
 def download(beat_name: str):
     kind = (request.args.get("kind") or "mp3").lower().strip()
-    if kind not in {"mp3", "wav", "flac", "ogg", "m4a"}:
+    if kind not in DOWNLOAD_KINDS:
         return jsonify({"ok": False, "error": "Supported formats: mp3, wav, flac, ogg, m4a"}), 400
 
     file_path = None
@@ -382,15 +483,22 @@ def download(beat_name: str):
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 404
 
-    if not file_path or not file_path.exists():
+    if not file_path:
          return jsonify({"ok": False, "error": "File not found after export"}), 404
 
-    return send_file(
-        file_path,
-        as_attachment=True,
-        download_name=file_path.name,
-        mimetype=f"audio/{kind}" if kind != "m4a" else "audio/mp4",
-    )
+    # conditional: ETag(mtime-size) / Last-Modified -> 304 및 Range 요청 지원.
+    # 같은 URL이 regenerate 후 다른 파일을 주므로 max_age=0 (캐시는 하되 매번 재검증)
+    try:
+        return send_file(
+            file_path,
+            as_attachment=True,
+            download_name=file_path.name,
+            mimetype=f"audio/{kind}" if kind != "m4a" else "audio/mp4",
+            conditional=True,
+            max_age=0,
+        )
+    except FileNotFoundError:
+        return jsonify({"ok": False, "error": "File not found after export"}), 404
 
 @beats_bp.get("/api/beats/<beat_name>/preview")
 def preview_audio(beat_name: str):
@@ -404,15 +512,19 @@ def preview_audio(beat_name: str):
         # Prefer wav path usually for preview if mp3 might be missing
         path_str = result.get("wav_path") or result.get("mp3_path")
         
-        if not path_str or not os.path.exists(path_str):
+        if not path_str:
             # If no audio yet, return 204 (No Content) instead of 404 to avoid console errors in browser
             return "", 204
+        # A stale path needs no exists() probe: send_file's stat raises and we fall to 204 below
             
         file_path = Path(path_str)
         print(f"[preview] Serving {file_path}")
+        # Same URL serves a new file after regenerate: let the browser keep its copy
+        # but revalidate (ETag/Last-Modified -> 304) instead of heuristic caching
         return send_file(
             file_path,
-            mimetype="audio/wav" if file_path.suffix == ".wav" else "audio/mpeg"
+            mimetype="audio/wav" if file_path.suffix == ".wav" else "audio/mpeg",
+            max_age=0,
         )
     except Exception as e:
         print(f"[preview] Error: {e}")
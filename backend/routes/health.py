@@ -1,8 +1,16 @@
-from flask import Blueprint, jsonify, current_app
+from flask import Blueprint, Response, current_app
 
 health_bp = Blueprint("health", __name__)
 
-@health_bp.get("/api/health")
+HEALTH_PATH = "/api/health"
+
+# Payload only depends on whether services are attached, so serialize both variants once
+_HEALTH_BODY = {
+    True: b'{"ok":true,"model_connected":true}\n',
+    False: b'{"ok":true,"model_connected":false}\n',
+}
+
+@health_bp.get(HEALTH_PATH)
 def health():
     """
     Server status check.
@@ -12,7 +20,28 @@ def health():
         hasattr(current_app, "state_manager") and 
         hasattr(current_app, "pipeline_service")
     )
-    return jsonify({
-        "ok": True, 
-        "model_connected": has_services
-    })
+    return Response(_HEALTH_BODY[has_services], mimetype="application/json")
+
+
+class HealthMiddleware:
+    """
+    WSGI wrapper answering GET/HEAD /api/health before Flask dispatch
+    (no request context, url matching, or after_request hooks for LB/uptime polling).
+    Install only after services are attached; the view above stays for anything that bypasses it.
+    """
+
+    _HEADERS = [
+        ("Content-Type", "application/json"),
+        ("Content-Length", str(len(_HEALTH_BODY[True]))),
+        # same header flask-cors would add for origins="*"
+        ("Access-Control-Allow-Origin", "*"),
+    ]
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        if environ.get("PATH_INFO") == HEALTH_PATH and environ.get("REQUEST_METHOD") in ("GET", "HEAD"):
+            start_response("200 OK", self._HEADERS)
+            return [] if environ["REQUEST_METHOD"] == "HEAD" else [_HEALTH_BODY[True]]
+        return self.wsgi_app(environ, start_response)
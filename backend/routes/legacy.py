@@ -1,20 +1,34 @@
-from pathlib import Path
+import os
 from flask import Blueprint, jsonify, request, current_app
 
+from services.uploads import AUDIO_UPLOAD_SUFFIXES, fsync_dir, safe_upload_name, save_upload
+from routes.parsing import parse_bool, parse_float, parse_int
+from routes.limits import job_queue_full
+
 legacy_bp = Blueprint("legacy", __name__)
 
 def get_pipeline_service():
     return current_app.pipeline_service
 
+def get_job_manager():
+    return current_app.job_manager
+
 @legacy_bp.post("/api/generate")
 def generate_legacy():
     """
     Legacy ALL-IN-ONE generate.
     Blocks until finished (SYNCHRONOUS for backward compat).
+    The pipeline always runs on the job pool; the request only waits for it.
+    With wait=<sec> it waits at most that long, then returns 202 + job_id with a
+    Location header (/api/jobs/<job_id>); async=1 is the same as wait=0.
     """
+    # request.form 접근 전에 확인: 큐가 꽉 찼으면 multipart 본문을 spool/저장하지 않고 바로 429
+    if get_job_manager().is_full():
+        return job_queue_full()
+
     beat_name = (request.form.get("beat_name") or request.form.get("project_name") or "beat_001").strip()
-    bpm = float(request.form.get("bpm") or 120.0)
-    seed = int(request.form.get("seed") or 42)
+    bpm = parse_float(request.form.get("bpm"), 120.0)
+    seed = parse_int(request.form.get("seed"), 42)
     style = (request.form.get("style") or "rock").strip()
 
     files = request.files.getlist("audio")
@@ -24,30 +38,47 @@ def generate_legacy():
     DEFAULT_OUTS_DIR = current_app.config["DEFAULT_OUTS_DIR"]
     input_dir = DEFAULT_OUTS_DIR / beat_name / "uploads"
     input_dir.mkdir(parents=True, exist_ok=True)
+    input_dir_str = os.fspath(input_dir)  # 파일마다 Path 객체를 만들지 않도록 str 경로로 join
 
     saved = []
     for f in files:
-        if not f.filename: continue
-        suffix = Path(f.filename).suffix.lower()
-        if suffix not in {".wav", ".mp3", ".flac", ".ogg", ".m4a", ".webm"}:
+        name = safe_upload_name(f.filename)
+        if not name: continue
+        suffix = os.path.splitext(name)[1].lower()
+        if suffix not in AUDIO_UPLOAD_SUFFIXES:
             return jsonify({"ok": False, "error": f"Unsupported extension: {suffix}"}), 400
         
-        out_path = input_dir / Path(f.filename).name
-        f.save(out_path)
-        saved.append(str(out_path))
+        out_path = os.path.join(input_dir_str, name)
+        save_upload(f, out_path)  # 1MB 버퍼 복사 (spool된 경우 rename)
+        saved.append(out_path)
 
     if not saved:
         return jsonify({"ok": False, "error": "No valid files saved."}), 400
+    fsync_dir(input_dir_str)
+
+    # wait 미지정: 기존처럼 끝날 때까지 대기 (request 스레드는 job을 기다리기만 함)
+    if parse_bool(request.form.get("async") or request.args.get("async")):
+        wait = 0.0
+    else:
+        wait = parse_float(request.form.get("wait") or request.args.get("wait"), None)
+
+    job_manager = get_job_manager()
+    job_id = job_manager.start_job(
+        get_pipeline_service().run_pipeline,
+        input_dir=input_dir,
+        project_name=beat_name,
+        bpm=bpm,
+        seed=seed,
+        style=style,
+    )
+    job = job_manager.wait_done(job_id, timeout=wait) if wait != 0 else None
+
+    if job is None or job["status"] == "running":
+        resp = jsonify({"ok": True, "job_id": job_id, "beat_name": beat_name})
+        resp.status_code = 202
+        resp.headers["Location"] = f"/api/jobs/{job_id}"
+        return resp
+    if job["status"] == "failed":
+        return jsonify({"ok": False, "error": job["error"]}), 500
 
-    try:
-        result = get_pipeline_service().run_pipeline(
-            input_dir=input_dir,
-            project_name=beat_name,
-            bpm=bpm,
-            seed=seed,
-            style=style,
-        )
-    except Exception as e:
-        return jsonify({"ok": False, "error": str(e)}), 500
-
-    return jsonify({"ok": True, "result": result})
+    return jsonify({"ok": True, "result": job["result"]})
@@ -0,0 +1,66 @@
+from flask import current_app, jsonify, request
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from services.job_manager import JobQueueFull
+
+# Seconds a client should wait before resubmitting when the job queue is full
+JOB_RETRY_AFTER = 10
+
+# JSON-only endpoints never need more than this; the global MAX_CONTENT_LENGTH is sized for audio uploads
+JSON_BODY_LIMIT = 1 << 20
+
+
+def limit_body(max_bytes: int):
+    """Per-view request body cap: checked against Content-Length up front and enforced while streaming."""
+    def decorator(fn):
+        fn.max_content_length = max_bytes
+        return fn
+    return decorator
+
+
+def enforce_body_limit():
+    """before_request hook: 413 as soon as the declared length exceeds the view's cap."""
+    view = current_app.view_functions.get(request.endpoint)
+    limit = getattr(view, "max_content_length", None)
+    if limit is None:
+        # upload views: app-wide MAX_CONTENT_LENGTH, rejected here instead of inside the multipart parser
+        limit = current_app.config.get("MAX_CONTENT_LENGTH")
+    else:
+        oversized = False
+        if request.content_length is None and "chunked" in request.headers.get("Transfer-Encoding", "").lower():
+            # get_data() silently truncates at the cap (-> 400 on bad JSON); read one byte past it
+            # so an oversized chunked body is a 413. The body stays cached for the view.
+            request.max_content_length = limit + 1
+            oversized = len(request.get_data(cache=True)) > limit
+        # Werkzeug enforces the view's cap while streaming (chunked bodies have no Content-Length).
+        # request.max_content_length is assignable from Flask 3.1 (requirements.txt pins it)
+        request.max_content_length = limit
+        if oversized:
+            return _too_large(limit)
+    length = request.content_length
+    if limit is not None and length and length > limit:
+        return _too_large(limit)
+    return None
+
+
+def handle_too_large(e: RequestEntityTooLarge):
+    """errorhandler: chunked bodies (no Content-Length) hit the cap while parsing -> same JSON 413."""
+    # per-view limit set by enforce_body_limit, else the app-wide MAX_CONTENT_LENGTH
+    return _too_large(request.max_content_length)
+
+
+def _too_large(limit):
+    error = f"Request body too large (limit {limit} bytes)" if limit else "Request body too large"
+    return jsonify({"ok": False, "error": error}), 413
+
+
+def handle_job_queue_full(e: JobQueueFull):
+    """errorhandler: job pool saturated -> 429 + Retry-After instead of queueing without bound."""
+    return job_queue_full(str(e))
+
+
+def job_queue_full(error: str = "Too many jobs running, try again later"):
+    resp = jsonify({"ok": False, "error": error})
+    resp.status_code = 429
+    resp.headers["Retry-After"] = str(JOB_RETRY_AFTER)
+    return resp
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import math
+import re
+from typing import Any
+
+# JSON body / form 값 파싱용 공용 헬퍼 (beats, legacy)
+_TRUE = frozenset({"1", "true", "yes", "y", "on"})
+_FALSE = frozenset({"0", "false", "no", "n", "off"})
+# 숫자 형태가 아니면 예외를 만들지 않고 default로
+_INT_RE = re.compile(r"[+-]?\d+")
+_FLOAT_RE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+
+
+def parse_bool(value: Any, default: bool = False) -> bool:
+    if isinstance(value, bool):
+        return value
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return bool(value)
+    s = str(value).strip().lower()
+    if s in _TRUE:
+        return True
+    if s in _FALSE:
+        return False
+    return default
+
+
+def parse_int(value: Any, default: int) -> int:
+    # JSON이 이미 숫자를 준 경우(대부분)는 str 변환 없이 바로 반환
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, float):
+        return int(value) if math.isfinite(value) else default
+    if value is None:
+        return default
+    s = str(value).strip()
+    try:
+        if _INT_RE.fullmatch(s):
+            return int(s)
+        if _FLOAT_RE.fullmatch(s):
+            f = float(s)
+            # "1e999" -> inf: int(inf)는 OverflowError
+            return int(f) if math.isfinite(f) else default
+    except (OverflowError, ValueError):
+        pass  # 자릿수 제한(sys.set_int_max_str_digits)을 넘는 정수 문자열 등
+    return default
+
+
+def parse_float(value: Any, default: float) -> float:
+    if isinstance(value, float):
+        return value if math.isfinite(value) else default
+    if isinstance(value, int) and not isinstance(value, bool):
+        try:
+            return float(value)
+        except OverflowError:
+            return default
+    if value is None:
+        return default
+    s = str(value).strip()
+    if _FLOAT_RE.fullmatch(s):
+        f = float(s)
+        # "1e999" -> inf 는 bpm 등에 그대로 쓰이면 안 되므로 default
+        return f if math.isfinite(f) else default
+    return default
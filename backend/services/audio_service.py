@@ -7,6 +7,11 @@ from .state_manager import StateManager
 
 logger = logging.getLogger(__name__)
 
+
+def _mtime(p: Path) -> float:
+    return p.stat().st_mtime
+
+
 class AudioService:
     def __init__(self, outs_root: Path, state_manager: StateManager):
         self.outs_root = outs_root
@@ -92,44 +97,46 @@ class AudioService:
         output_root = (self.outs_root / beat_name).resolve()
         final_dir = output_root / "7_final"
         
-        if final_dir.exists():
-            mp3s = sorted(list(final_dir.glob("*.mp3")), key=lambda p: p.stat().st_mtime)
-            wavs = sorted(list(final_dir.glob("*.wav")), key=lambda p: p.stat().st_mtime)
-            
-            if mp3s:
-                latest_mp3 = mp3s[-1]
-                # Try to find corresponding wav by name
-                latest_wav = latest_mp3.with_suffix(".wav")
-                return {
-                    "beat_name": beat_name,
-                    "mp3_path": str(latest_mp3.resolve()),
-                    "wav_path": str(latest_wav.resolve()) if latest_wav.exists() else (str(wavs[-1].resolve()) if wavs else ""),
-                    "final_dir": str(final_dir.resolve()),
-                }
-            elif wavs:
-                latest_wav = wavs[-1]
-                return {
-                    "beat_name": beat_name,
-                    "mp3_path": "",
-                    "wav_path": str(latest_wav.resolve()),
-                    "final_dir": str(final_dir.resolve()),
-                }
+        # output_root is already resolved, so glob results are absolute and need no resolve();
+        # glob on a missing dir just yields nothing, so no exists() probe either
+        mp3s = list(final_dir.glob("*.mp3"))
+        if mp3s:
+            latest_mp3 = max(mp3s, key=_mtime)
+            # Try to find corresponding wav by name
+            latest_wav = latest_mp3.with_suffix(".wav")
+            if not latest_wav.exists():
+                wavs = list(final_dir.glob("*.wav"))
+                latest_wav = max(wavs, key=_mtime) if wavs else None
+            return {
+                "beat_name": beat_name,
+                "mp3_path": str(latest_mp3),
+                "wav_path": str(latest_wav) if latest_wav else "",
+                "final_dir": str(final_dir),
+            }
+
+        wavs = list(final_dir.glob("*.wav"))
+        if wavs:
+            return {
+                "beat_name": beat_name,
+                "mp3_path": "",
+                "wav_path": str(max(wavs, key=_mtime)),
+                "final_dir": str(final_dir),
+            }
 
         # 3. Fallback to Stage 6 Preview
         # If no Stage 7 output, check Stage 6 preview
         s6_dir = output_root / "6_editor"
-        if s6_dir.exists():
-            previews = list(s6_dir.glob("preview_*.wav"))
-            if previews:
-                latest_preview = max(previews, key=lambda p: p.stat().st_mtime)
-                # We return this as 'wav_path' effectively.
-                # Frontend might prefer mp3 path, but we only have wav.
-                return {
-                    "beat_name": beat_name,
-                    "mp3_path": "", # No MP3
-                    "wav_path": str(latest_preview.resolve()),
-                    "is_preview": True
-                }
+        previews = list(s6_dir.glob("preview_*.wav"))
+        if previews:
+            latest_preview = max(previews, key=_mtime)
+            # We return this as 'wav_path' effectively.
+            # Frontend might prefer mp3 path, but we only have wav.
+            return {
+                "beat_name": beat_name,
+                "mp3_path": "", # No MP3
+                "wav_path": str(latest_preview),
+                "is_preview": True
+            }
 
         raise FileNotFoundError(f"No audio output found for {beat_name} (checked s7 final and s6 preview)")
     
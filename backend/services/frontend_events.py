@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .json_io import load_json_cached, save_json
+
+# 파이프라인이 event grid를 쓸 때 같이 만들어 두는 프론트용 이벤트 파일
+FRONTEND_EVENTS_NAME = "latest_events_frontend.json"
+
+
+def to_frontend_events(events_data: Any, steps_per_bar: int) -> List[Dict[str, Any]]:
+    """event_grid JSON (list or {"events": [...]}) -> editor events {step, role, velocity, duration, sampleId, offset}."""
+    raw_events = events_data if isinstance(events_data, list) else events_data.get("events", [])
+
+    # 이벤트 수만큼 도는 루프라 fallback 키는 필요할 때만 조회 (중첩 .get 기본값을 매번 평가하지 않음)
+    transformed_events = []
+    append = transformed_events.append
+    for e in raw_events:
+        abs_step = (e["bar"] * steps_per_bar + e["step"]) if "bar" in e else e["step"]
+        vel = e["vel"] if "vel" in e else e.get("velocity", 0.8)
+        final_vel = int(vel * 127) if isinstance(vel, float) and vel <= 1.0 else int(vel)
+
+        append({
+            "step": abs_step,
+            "role": e["role"],
+            "velocity": final_vel,
+            "duration": e["dur_steps"] if "dur_steps" in e else e.get("duration", 1),
+            "sampleId": e.get("sample_id"),
+            "offset": e.get("micro_offset_ms", 0)
+        })
+    return transformed_events
+
+
+def bake_frontend_events(project_dir: Path, grid_json: str, event_json: str, pretty: bool = False) -> Dict[str, Any]:
+    """
+    Writes the frontend-shaped events for `event_json` next to state.json and returns
+    the state entry describing it ({"path", "source", "steps_per_bar"}).
+    """
+    steps_per_bar = load_json_cached(grid_json).get("steps_per_bar", 16)
+    out_path = project_dir / FRONTEND_EVENTS_NAME
+    save_json(out_path, to_frontend_events(load_json_cached(event_json), steps_per_bar), pretty=pretty)
+    return {"path": str(out_path), "source": str(event_json), "steps_per_bar": steps_per_bar}
@@ -2,11 +2,16 @@ import time
 import uuid
 import threading
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Dict, Optional, Any
 
 logger = logging.getLogger(__name__)
 
+class JobQueueFull(RuntimeError):
+    """Raised by start_job when every worker is busy and the wait queue is full."""
+
+
 @dataclass
 class JobInfo:
     job_id: str
@@ -18,24 +23,38 @@ class JobInfo:
     created_at: float = field(default_factory=time.time)
 
 class JobManager:
-    def __init__(self):
+    def __init__(self, max_workers: int = 2, max_queued: int = 8):
         self._jobs: Dict[str, JobInfo] = {}
+        # 스레드를 job마다 새로 만들지 않고 고정 크기 풀에서 실행.
+        # 파이프라인은 무거운 subprocess라 동시에 max_workers개만 돌고 나머지는 큐에서 대기.
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        # 실행 중 + 대기 중 job 수 (_job_lock 보호). 다 차면 큐에 무한정 쌓지 않고 JobQueueFull (-> 429)
+        self._max_pending = max_workers + max_queued
+        self._pending = 0
         self._job_lock = threading.Lock()
+        # notified on every status/progress change (SSE progress stream waits on it)
+        self._job_changed = threading.Condition(self._job_lock)
 
     def start_job(self, func, *args, **kwargs) -> str:
-        """Starts a background thread for the given function and returns a job_id."""
+        """Submits the function to the job pool and returns a job_id. Raises JobQueueFull when saturated."""
         job_id = str(uuid.uuid4())
         beat_name = kwargs.get("project_name") or kwargs.get("beat_name") or "unknown"
 
         with self._job_lock:
+            if self._pending >= self._max_pending:
+                raise JobQueueFull("Too many jobs running, try again later")
+            self._pending += 1
             self._jobs[job_id] = JobInfo(
                 job_id=job_id,
                 project_name=beat_name,
                 status="running",
-                progress="Starting...",
+                progress="Queued...",
             )
 
         def wrapper():
+            with self._job_lock:
+                self._jobs[job_id].progress = "Starting..."
+                self._job_changed.notify_all()
             try:
                 # Execute the function
                 res = func(*args, **kwargs)
@@ -44,31 +63,79 @@ class JobManager:
                     job.status = "completed"
                     job.progress = "Done"
                     job.result = res
+                    self._job_changed.notify_all()
             except Exception as e:
                 logger.exception(f"Job {job_id} failed: {e}")
                 with self._job_lock:
                     job = self._jobs[job_id]
                     job.status = "failed"
                     job.error = str(e)
+                    self._job_changed.notify_all()
+            finally:
+                with self._job_lock:
+                    self._pending -= 1
 
-        t = threading.Thread(target=wrapper, daemon=True)
-        t.start()
+        try:
+            self._executor.submit(wrapper)
+        except BaseException:
+            with self._job_lock:
+                del self._jobs[job_id]
+                self._pending -= 1
+            raise
         return job_id
 
+    def is_full(self) -> bool:
+        """Best-effort check so routes can refuse before doing side effects (start_job still decides)."""
+        with self._job_lock:
+            return self._pending >= self._max_pending
+
     def get_job(self, job_id: str) -> Optional[Dict]:
         with self._job_lock:
+            return self._job_dict(job_id)
+
+    def wait_job(self, job_id: str, last: Optional[Dict], timeout: float) -> Optional[Dict]:
+        """
+        Blocks until the job's status/progress differs from `last` (or timeout),
+        then returns the current job dict. None if the job does not exist.
+        """
+        def changed() -> bool:
             job = self._jobs.get(job_id)
-            if not job:
-                return None
-            return {
-                "job_id": job.job_id,
-                "beat_name": job.project_name, 
-                "status": job.status,
-                "progress": job.progress,
-                "result": job.result,
-                "error": job.error,
-                "created_at": job.created_at,
-            }
+            return (
+                job is None or last is None
+                or job.status != last["status"] or job.progress != last["progress"]
+            )
+
+        with self._job_changed:
+            self._job_changed.wait_for(changed, timeout=timeout)
+            return self._job_dict(job_id)
+
+    def wait_done(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict]:
+        """
+        Blocks until the job is no longer running (or timeout; None waits indefinitely),
+        then returns the current job dict. None if the job does not exist.
+        """
+        def done() -> bool:
+            job = self._jobs.get(job_id)
+            return job is None or job.status != "running"
+
+        with self._job_changed:
+            self._job_changed.wait_for(done, timeout=timeout)
+            return self._job_dict(job_id)
+
+    def _job_dict(self, job_id: str) -> Optional[Dict]:
+        # caller holds _job_lock
+        job = self._jobs.get(job_id)
+        if not job:
+            return None
+        return {
+            "job_id": job.job_id,
+            "beat_name": job.project_name, 
+            "status": job.status,
+            "progress": job.progress,
+            "result": job.result,
+            "error": job.error,
+            "created_at": job.created_at,
+        }
 
     def update_job_progress(self, beat_name: str, progress: str):
         # Find active job for this project
@@ -76,3 +143,4 @@ class JobManager:
             for job in self._jobs.values():
                 if job.project_name == beat_name and job.status == "running":
                     job.progress = progress
+            self._job_changed.notify_all()
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Tuple
+
+import orjson
+
+# state.json / role_pools 등 다른 서비스가 읽는 파일들
+_DUMP_OPTION = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def load_json(path: str | Path) -> Any:
+    return orjson.loads(Path(path).read_bytes())
+
+
+def loads_json(data: bytes) -> Any:
+    return orjson.loads(data)
+
+
+@lru_cache(maxsize=32)
+def _load_json_cached(path: str, mtime_ns: int, size: int) -> Any:
+    return orjson.loads(Path(path).read_bytes())
+
+
+def load_json_cached(path: str | Path, st: os.stat_result | None = None) -> Any:
+    """
+    grid / event_grid / role_pools 처럼 한 번 쓰이고 여러 번 읽히는 파일용.
+    (path, mtime, size) 가 같으면 파싱 결과를 재사용하므로 반환값은 수정하지 말고 복사해서 쓸 것.
+    호출 측에서 이미 stat 했다면 st 로 넘겨서 중복 stat을 피할 수 있음.
+    """
+    if st is None:
+        st = os.stat(path)
+    return _load_json_cached(str(path), st.st_mtime_ns, st.st_size)
+
+
+def write_bytes_atomic(path: str | Path, data: bytes) -> os.stat_result:
+    """
+    tmp 파일에 쓴 뒤 os.replace 로 교체: 폴링 중인 reader가 반쯤 쓰인 JSON을 보지 않도록.
+    tmp 이름에 pid/thread id를 넣어 같은 파일을 동시에 쓰는 job 스레드끼리 충돌하지 않게 함.
+    반환값은 교체 직전 tmp의 fstat (replace 이후 path를 stat하면 다른 writer의 파일일 수 있음).
+    """
+    path = str(path)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            st = os.fstat(f.fileno())
+        os.replace(tmp, path)
+        return st
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def save_json(path: str | Path, obj: Any, pretty: bool = False) -> Tuple[bytes, os.stat_result]:
+    """Writes obj atomically; returns the serialized bytes and the stat of the file written."""
+    # 기본은 compact. indent는 사람이 직접 볼 때만 (JSON_PRETTY / ?pretty=1)
+    option = _DUMP_OPTION | orjson.OPT_INDENT_2 if pretty else _DUMP_OPTION
+    data = orjson.dumps(obj, option=option)
+    return data, write_bytes_atomic(path, data)
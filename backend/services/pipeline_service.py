@@ -3,11 +3,13 @@ import subprocess
 import time
 import logging
 import os
+import threading
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 
 from .state_manager import StateManager
 from .job_manager import JobManager
+from .frontend_events import bake_frontend_events
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +53,10 @@ class PipelineService:
         self.pipeline_dir = (self.model_dir / "pipeline").resolve()
         self.outs_root = (self.project_root / "outs").resolve()
 
+        # (beat_name, fmt) -> Lock: 같은 export가 동시에 요청되면 step7은 한 번만 돌고 나머지는 결과를 재사용
+        self._export_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._export_locks_guard = threading.Lock()
+
     def _get_project_dir(self, beat_name: str) -> Path:
         return self.outs_root / beat_name
 
@@ -68,14 +74,16 @@ class PipelineService:
         beat_name = project_name
         start_time = time.time()
         project_dir = self._get_project_dir(beat_name)
-        project_dir.mkdir(parents=True, exist_ok=True)
 
         # Merge config
         state = self.state_manager.get_state(beat_name)
         config = state.get("config", {})
         if config_overrides:
-            config.update(config_overrides)
-            self.state_manager.update_state(beat_name, {"config": config})
+            merged = {**config, **config_overrides}
+            # generate_initial already persisted the same config; skip the redundant rewrite
+            if merged != config:
+                config = merged
+                self.state_manager.update_state(beat_name, {"config": config})
 
         # Parameters
         bpm = float(config.get("bpm", 120.0))
@@ -97,6 +105,7 @@ class PipelineService:
             "s6": project_dir / "6_editor",
             "s7": project_dir / "7_final",
         }
+        # parents=True also creates project_dir on the first stage dir
         for d in dirs.values():
             d.mkdir(parents=True, exist_ok=True)
 
@@ -230,9 +239,19 @@ class PipelineService:
             except FileNotFoundError:
                 pass
             
+            # 상태 폴링마다 이벤트를 변환하지 않도록 프론트용 events를 여기서 한 번 만들어 둠
+            try:
+                frontend_events = bake_frontend_events(
+                    project_dir, str(grid_json), str(final_events), pretty=self.state_manager.pretty
+                )
+            except Exception as e:
+                logger.warning(f"[pipeline] frontend events not baked: {e}")
+                frontend_events = None
+
             state = self.state_manager.update_state(beat_name, {
                 "latest_event_grid_json": str(final_events),
-                "latest_grid_json": str(grid_json)
+                "latest_grid_json": str(grid_json),
+                "frontend_events": frontend_events,
             })
 
         # ---- Stage 6: Editor ----
@@ -310,7 +329,14 @@ class PipelineService:
         """
         Runs ONLY Stage 7 for a specific format on demand.
         Returns the absolute path to the generated file.
+        Reuses the previous export of this format if it is newer than the editor events it would render.
         """
+        with self._export_locks_guard:
+            lock = self._export_locks.setdefault((beat_name, fmt), threading.Lock())
+        with lock:
+            return self._run_export(beat_name, fmt)
+
+    def _run_export(self, beat_name: str, fmt: str) -> Path:
         state = self.state_manager.get_state(beat_name)
         project_dir = self._get_project_dir(beat_name)
         
@@ -341,6 +367,17 @@ class PipelineService:
         else:
             name = f"{beat_name}_final"
 
+        # 입력(editor events)보다 새로운 같은 이름의 export가 있으면 렌더링 생략
+        cached = state.get(f"latest_{fmt}")
+        if cached:
+            cached_path = Path(cached)
+            if cached_path.stem == name or cached_path.stem.startswith(f"{name}_"):
+                try:
+                    if os.stat(cached).st_mtime_ns >= os.stat(editor_events).st_mtime_ns:
+                        return cached_path
+                except OSError:
+                    pass  # missing output or input: render below
+
         logger.info(f"Running on-demand export for {beat_name} -> {fmt}")
         _run_step(self.project_root, self.pipeline_dir, "step7_run_render_final.py", [
             "--grid_json", str(grid_json),
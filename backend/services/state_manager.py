@@ -1,14 +1,36 @@
-import json
 import time
 import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+
+from .json_io import load_json, loads_json, save_json
 
 logger = logging.getLogger(__name__)
 
+# 최근에 쓴 프로젝트 state만 메모리에 유지 (나머지는 디스크에서 읽음)
+_WRITTEN_CACHE_MAX = 64
+
 class StateManager:
-    def __init__(self, outs_root: Path):
+    def __init__(self, outs_root: Path, pretty: bool = False):
         self.outs_root = outs_root
+        self.pretty = pretty
+        # state path -> ((inode, mtime_ns), bytes) of our own last write; one entry per path, LRU-bounded.
+        # 프론트 폴링/라우트마다 get_state를 부르므로 방금 쓴 내용은 디스크를 다시 읽지 않음
+        self._written: "OrderedDict[str, Tuple[Tuple[int, int], bytes]]" = OrderedDict()
+        self._written_lock = threading.Lock()
+
+    def _remember(self, key: str, entry: Tuple[Tuple[int, int], bytes]) -> None:
+        with self._written_lock:
+            self._written[key] = entry
+            self._written.move_to_end(key)
+            while len(self._written) > _WRITTEN_CACHE_MAX:
+                self._written.popitem(last=False)
+
+    def _forget(self, key: str) -> None:
+        with self._written_lock:
+            self._written.pop(key, None)
 
     def _get_project_dir(self, beat_name: str) -> Path:
         return self.outs_root / beat_name
@@ -19,11 +41,17 @@ class StateManager:
     def get_state(self, beat_name: str) -> Dict[str, Any]:
         """Reads state.json for the project."""
         p = self._get_state_path(beat_name)
-        if not p.exists():
-            return {}
         try:
-            with open(p, "r", encoding="utf-8") as f:
-                return json.load(f)
+            cached = self._written.get(str(p))
+            if cached is not None:
+                st = p.stat()
+                if (st.st_ino, st.st_mtime_ns) == cached[0]:
+                    return loads_json(cached[1])
+                self._forget(str(p))  # rewritten by someone else: the bytes are stale
+            return load_json(p)
+        except FileNotFoundError:
+            self._forget(str(p))  # deleted project
+            return {}
         except Exception as e:
             logger.error(f"Failed to read state.json for {beat_name}: {e}")
             return {}
@@ -35,10 +63,17 @@ class StateManager:
         current["updated_at"] = time.time()
 
         p = self._get_state_path(beat_name)
-        p.parent.mkdir(parents=True, exist_ok=True)
-        with open(p, "w", encoding="utf-8") as f:
-            json.dump(current, f, indent=2, ensure_ascii=False)
+        try:
+            data, st = save_json(p, current, pretty=self.pretty)
+        except FileNotFoundError:
+            # First write for a new project: create the folder only then
+            p.parent.mkdir(parents=True, exist_ok=True)
+            data, st = save_json(p, current, pretty=self.pretty)
+        # stat of the file we wrote (taken before the rename), not whatever is at p now:
+        # a concurrent writer's replace must not get tagged with our bytes
+        self._remember(str(p), ((st.st_ino, st.st_mtime_ns), data))
         return current
+
     def rename_project(self, old_name: str, new_name: str) -> Path:
         """Renames the project directory and returns the new path."""
         old_dir = self._get_project_dir(old_name)
@@ -55,6 +90,7 @@ class StateManager:
             
         import shutil
         shutil.move(str(old_dir), str(new_dir))
+        self._forget(str(self._get_state_path(old_name)))
         
         # After move, we might need to update paths INSIDE state.json if they are absolute.
         state = self.get_state(new_name)
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import tempfile
+from io import BytesIO
+from pathlib import Path
+
+from flask import Request, current_app
+from werkzeug.datastructures import FileStorage
+
+# 오디오 업로드는 수십 MB 단위라 기본 16KB 청크 대신 1MB 단위로 복사
+COPY_BUFSIZE = 1 << 20
+
+# Small bodies stay in memory (same threshold as Werkzeug's default stream factory)
+_IN_MEMORY_MAX = 500 * 1024
+SPOOL_SUFFIX = ".upload"
+
+# Union of what the upload routes accept; other file parts are not worth writing anywhere
+AUDIO_UPLOAD_SUFFIXES = frozenset({".wav", ".mp3", ".flac", ".ogg", ".m4a", ".webm"})
+
+# 클라이언트 파일명은 최대한 그대로 저장 (삭제 요청이 원래 이름으로 들어옴).
+# 경로 구분자(basename만 사용)·'.'/'..'·제어문자만 걸러냄
+_CONTROL_CHARS = re.compile(r"[\x00-\x1f\x7f]")
+_MAX_NAME_LEN = 200
+
+
+def safe_upload_name(filename: str | None) -> str:
+    """Basename of the client filename without control characters ('' if nothing usable is left)."""
+    if not filename:
+        return ""
+    name = filename.replace("\\", "/").rsplit("/", 1)[-1]
+    name = _CONTROL_CHARS.sub("", name)
+    if name in (".", ".."):
+        return ""
+    return name[-_MAX_NAME_LEN:]
+
+
+class _DiscardStream(BytesIO):
+    """Sink for file parts the routes would reject anyway: the body is consumed but not stored."""
+
+    def write(self, b) -> int:
+        return len(b)
+
+
+class UploadRequest(Request):
+    """
+    Werkzeug spools large file parts to a SpooledTemporaryFile in the system tmp dir,
+    and save() then copies them again into outs/. Here parts are spooled straight into
+    UPLOAD_SPOOL_DIR (same filesystem as outs/), so save_upload() can rename instead of copy.
+    Spool files that were not moved are removed when the request closes.
+    Parts whose filename is not an audio file are discarded while parsing.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if filename and os.path.splitext(filename)[1].lower() not in AUDIO_UPLOAD_SUFFIXES:
+            return _DiscardStream()
+
+        spool_dir = current_app.config.get("UPLOAD_SPOOL_DIR")
+        if not spool_dir or (total_content_length is not None and total_content_length <= _IN_MEMORY_MAX):
+            return BytesIO()
+
+        fd, path = tempfile.mkstemp(dir=spool_dir, suffix=SPOOL_SUFFIX)
+        os.close(fd)
+        os.chmod(path, 0o644)  # mkstemp is 0600; the file becomes the final upload
+        self.__dict__.setdefault("_spooled_paths", []).append(path)
+        # reopen by path so stream.name is the path (save_upload relies on it)
+        return open(path, "w+b", buffering=COPY_BUFSIZE)
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            for path in self.__dict__.pop("_spooled_paths", ()):
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass  # moved into place by save_upload
+
+
+def save_upload(f: FileStorage, out_path: str | Path) -> None:
+    """
+    Moves/copies the upload into out_path without ever exposing a partial file there
+    (copies go to a .part neighbour and are renamed).
+    """
+    stream = f.stream
+    spooled = getattr(stream, "name", None)
+    if isinstance(spooled, str) and spooled.endswith(SPOOL_SUFFIX):
+        stream.flush()
+        try:
+            os.replace(spooled, out_path)
+            return
+        except OSError:
+            pass  # different filesystem: fall back to copying
+        stream.seek(0)
+
+    part = f"{os.fspath(out_path)}.part"
+    try:
+        with open(part, "wb", buffering=COPY_BUFSIZE) as out:
+            shutil.copyfileobj(stream, out, length=COPY_BUFSIZE)
+        os.replace(part, out_path)
+    except BaseException:
+        try:
+            os.unlink(part)
+        except OSError:
+            pass
+        raise
+
+
+def fsync_dir(path: str | Path) -> None:
+    """
+    Persists the renames done in `path` (one fsync for the whole upload batch).
+    File data itself is not fsynced per file; that stall is what the batch avoids.
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass  # some filesystems (and Windows) don't support fsync on directories
+    finally:
+        os.close(fd)
@@ -58,7 +58,8 @@ export interface BeatCreationResponse {
 export interface FileUploadResponse {
     ok: boolean;
     beat_name?: string;
-    uploaded?: Array<{ name: string; size: number; saved_path: string }>;
+    count?: number;
+    uploaded?: Array<{ name: string; original_name: string; saved_path: string }>;
     error?: string;
 }
 
@@ -104,7 +105,7 @@ export const beatApi = {
     },
 
     async deleteFile(beatName: string, filename: string): Promise<{ ok: boolean; error?: string }> {
-        const res = await fetch(`${API_BASE}/api/beats/${beatName}/files/${filename}`, {
+        const res = await fetch(`${API_BASE}/api/beats/${beatName}/files/${encodeURIComponent(filename)}`, {
             method: 'DELETE',
         });
         if (!res.ok) throw new Error('Delete failed');
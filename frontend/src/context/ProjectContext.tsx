@@ -153,9 +153,13 @@ export const ProjectProvider: React.FC<{ children: React.ReactNode }> = ({ child
         setIsUploading(true);
 
         try {
-            await beatApi.uploadFiles(beatName, files);
+            const res = await beatApi.uploadFiles(beatName, files);
+            // 서버가 실제로 저장한 이름을 id로 보관 (삭제 요청은 이 이름으로)
+            const savedNames = new Map((res.uploaded || []).map(u => [u.original_name, u.name] as [string, string]));
             setUploadedFiles(prev => prev.map(f =>
-                newFiles.some(nf => nf.id === f.id) ? { ...f, status: 'done' } : f
+                newFiles.some(nf => nf.id === f.id)
+                    ? { ...f, id: savedNames.get(f.name) ?? f.id, status: 'done' }
+                    : f
             ));
             await refreshState();
         } catch (e) {
@@ -172,11 +176,13 @@ export const ProjectProvider: React.FC<{ children: React.ReactNode }> = ({ child
     const handleRemove = async (filename: string) => {
         if (!beatName) return;
 
+        const savedName = uploadedFiles.find(f => f.name === filename)?.id ?? filename;
+
         // Optimistic Remove
         setUploadedFiles(prev => prev.filter(f => f.name !== filename));
 
         try {
-            await beatApi.deleteFile(beatName, filename);
+            await beatApi.deleteFile(beatName, savedName);
             await refreshState();
         } catch (e) {
             console.error(e);
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+# 파이프라인 산출물(grid/skeleton/pools/event_grid)은 다른 stage와 backend가 읽는 파일이라
+# 기본은 compact. 사람이 직접 볼 때만 SOUNDROUTINE_JSON_PRETTY=1 로 indent 출력.
+PRETTY = os.environ.get("SOUNDROUTINE_JSON_PRETTY", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def dumps_json(obj: Any) -> str:
+    if PRETTY:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_json(path: str | Path, obj: Any) -> None:
+    # tmp에 쓰고 os.replace: 중간에 죽어도 grid_*.json 같은 glob에 잘린 파일이 잡히지 않음
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(dumps_json(obj), encoding="utf-8")
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import argparse
-import json
+import os
 from dataclasses import asdict
 from pathlib import Path
 from typing import List, Dict, Any
@@ -20,6 +20,7 @@ from stage2_role_assignment.role_assigner import (
     RoleAssigner,
     RoleAssignerConfig,
 )
+from stage2_role_assignment.types import Role
 from stage2_role_assignment.dsp.audio_io import AudioLoadConfig
 from stage2_role_assignment.dsp.features import DSPConfig
 from stage2_role_assignment.dsp.rule_scoring import (
@@ -32,9 +33,10 @@ from stage2_role_assignment.clap.scoring import ClapScoringConfig
 from stage2_role_assignment.fusion.fuse import FusionConfig
 from stage2_role_assignment.fusion.guards import GuardsConfig, TextureSuppressConfig, SustainedNoiseSuppressConfig, MotionMinConditionConfig, FillConservativeConfig, LowConfTextureExtraSuppressConfig
 from stage2_role_assignment.pool.build_pools import PoolConfig, build_pools, pools_to_json_dict
+from pipeline.json_io import write_json
 
 
-AUDIO_EXTS = {".wav", ".mp3", ".m4a"}
+AUDIO_EXTS = frozenset({".wav", ".mp3", ".m4a"})
 
 
 def parse_args() -> argparse.Namespace:
@@ -58,9 +60,14 @@ def load_yaml(path: str) -> Dict[str, Any]:
         return yaml.safe_load(f)
 
 
-def build_assigner_config(cfg_dict: Dict[str, Any], prompts_path: str) -> tuple[RoleAssignerConfig, PoolConfig, Dict[str, Any]]:
+def build_assigner_config(
+    cfg_dict: Dict[str, Any],
+    prompts_path: str,
+    prompts: Dict[str, Any] | None = None,
+) -> tuple[RoleAssignerConfig, PoolConfig, Dict[str, Any]]:
     """
     role_assignment.yaml을 파이썬 dataclass config로 변환
+    prompts: 이미 읽은 prompts.yaml 내용이 있으면 넘겨서 ClapScorer가 같은 파일을 다시 파싱하지 않게 함
     """
     # --- audio ---
     audio_cfg = AudioLoadConfig(
@@ -123,6 +130,7 @@ def build_assigner_config(cfg_dict: Dict[str, Any], prompts_path: str) -> tuple[
 
     clap_scoring_cfg = ClapScoringConfig(
         prompts_yaml_path=prompts_path,
+        prompts=prompts,
         tau_clap=float(cfg_dict["clap"]["tau_clap"]),
         cache_text_embeddings=bool(cfg_dict["clap"]["cache_text_embeddings"]),
         cache_dir=str(cfg_dict["clap"]["cache_dir"]),
@@ -159,16 +167,19 @@ def build_assigner_config(cfg_dict: Dict[str, Any], prompts_path: str) -> tuple[
 
     # --- pool ---
     pool_d = cfg_dict["pool"]
+    pwm = pool_d["promote_when_missing"]
+    pwm_forbid_core = pwm["forbid_core_if"]
+    rwe = pool_d["rebalance_when_excess"]
     pool_cfg = PoolConfig(
         required_roles=list(pool_d["required_roles"]),
         max_sizes={k: int(v) for k, v in pool_d["max_sizes"].items()},
-        promote_when_missing_enabled=bool(pool_d["promote_when_missing"]["enabled"]),
-        forbid_core_if_decay_long_threshold=float(pool_d["promote_when_missing"]["forbid_core_if"]["decay_long_threshold"]),
-        forbid_core_if_flatness_threshold=float(pool_d["promote_when_missing"]["forbid_core_if"]["flatness_threshold"]),
-        forbid_motion_if_high_ratio_threshold=float(pool_d["promote_when_missing"]["forbid_motion_if"]["high_ratio_threshold"]),
-        rebalance_when_excess_enabled=bool(pool_d["rebalance_when_excess"]["enabled"]),
-        min_margin_keep=float(pool_d["rebalance_when_excess"]["min_margin_keep"]),
-        try_third_best_if_target_excess=bool(pool_d["rebalance_when_excess"]["try_third_best_if_target_excess"]),
+        promote_when_missing_enabled=bool(pwm["enabled"]),
+        forbid_core_if_decay_long_threshold=float(pwm_forbid_core["decay_long_threshold"]),
+        forbid_core_if_flatness_threshold=float(pwm_forbid_core["flatness_threshold"]),
+        forbid_motion_if_high_ratio_threshold=float(pwm["forbid_motion_if"]["high_ratio_threshold"]),
+        rebalance_when_excess_enabled=bool(rwe["enabled"]),
+        min_margin_keep=float(rwe["min_margin_keep"]),
+        try_third_best_if_target_excess=bool(rwe["try_third_best_if_target_excess"]),
     )
 
     return assigner_cfg, pool_cfg, cfg_dict
@@ -188,15 +199,26 @@ def list_audio_files(input_dir: str) -> List[Path]:
     else:
         search_root = root
         
+    # rglob + is_file()은 엔트리마다 stat을 다시 하므로 scandir의 d_type 으로 DFS
     files = []
-    for p in search_root.rglob("*"):
-        if p.is_file() and p.suffix.lower() in AUDIO_EXTS:
-            files.append(p)
+    stack = [str(search_root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in AUDIO_EXTS:
+                    files.append(Path(entry.path))
     return sorted(files)
 
 
+# Role(str, Enum) -> "CORE" ... (str 키도 같은 해시라 그대로 매칭됨)
+_ROLE_STR: Dict[Any, str] = {r: r.value for r in Role}
+
+
 def _k(x):
-    return x.value if hasattr(x, "value") else str(x)
+    s = _ROLE_STR.get(x)
+    return s if s is not None else str(x)
 
 def sample_result_to_debug_dict(sr) -> Dict[str, Any]:
     return {
@@ -245,7 +267,7 @@ def main():
             "topk": prompts_yaml["ensemble"].get("topk", 3),
         }
 
-    assigner_cfg, pool_cfg, _cfg_dict = build_assigner_config(cfg, prompts_path=args.prompts)
+    assigner_cfg, pool_cfg, _cfg_dict = build_assigner_config(cfg, prompts_path=args.prompts, prompts=prompts_yaml)
 
     assigner = RoleAssigner(assigner_cfg)
 
@@ -263,10 +285,7 @@ def main():
     if not files:
         raise RuntimeError(f"No audio files found in: {input_dir}")
 
-    results = []
-    for f in tqdm(files, desc="Assign roles"):
-        sr = assigner.assign_file(f)
-        results.append(sr)
+    results = list(tqdm(assigner.assign_files(files), total=len(files), desc="Assign roles"))
 
     pools = build_pools(results, pool_cfg)
     pools_json = pools_to_json_dict(pools)
@@ -310,10 +329,10 @@ def main():
     
     debug_name = Path(base_debug_name).stem + generated_suffix + Path(base_debug_name).suffix
     
-    (out_dir / pools_name).write_text(json.dumps(pools_json, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_json(out_dir / pools_name, pools_json)
     
     debug_list = [sample_result_to_debug_dict(x) for x in results]
-    (out_dir / debug_name).write_text(json.dumps(debug_list, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_json(out_dir / debug_name, debug_list)
 
     # 콘솔 요약
     counts = pools_json["counts"]
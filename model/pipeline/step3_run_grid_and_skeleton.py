@@ -3,7 +3,8 @@ from __future__ import annotations
 
 import argparse
 import json
-from dataclasses import asdict, is_dataclass
+from dataclasses import asdict, fields, is_dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List
 
@@ -13,6 +14,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from stage3_beat_grid.grid import GridConfig, build_grid
 from stage3_beat_grid.patterns.skeleton import SkeletonConfig, build_skeleton_events
+from pipeline.json_io import write_json
 
 AUDIO_EXTS = {".wav", ".mp3", ".flac", ".ogg", ".m4a"}
 
@@ -93,6 +95,28 @@ def _jsonable(obj: Any) -> Any:
     return obj
 
 
+_PRIMITIVES = (str, int, float, bool, type(None))
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> tuple:
+    return tuple(f.name for f in fields(cls))
+
+
+def _event_to_dict(e: Any) -> Any:
+    """
+    Event(dataclass) 전용 fast path: asdict()의 deepcopy와 필드별 재귀 없이
+    primitive 값은 그대로 쓰고 나머지만 _jsonable 로 넘김
+    """
+    if not is_dataclass(e):
+        return _jsonable(e)
+    out = {}
+    for name in _field_names(type(e)):
+        v = getattr(e, name)
+        out[name] = v if isinstance(v, _PRIMITIVES) else _jsonable(v)
+    return out
+
+
 def main() -> None:
     args = parse_args()
     out_dir = Path(args.out_dir)
@@ -108,17 +132,7 @@ def main() -> None:
     )
     grid = build_grid(gcfg)
 
-    grid_json = {
-        "bpm": float(grid.cfg.bpm),
-        "meter": f"{int(grid.cfg.meter_numer)}/{int(grid.cfg.meter_denom)}",
-        "steps_per_bar": int(grid.cfg.steps_per_bar),
-        "num_bars": int(grid.cfg.num_bars),
-        "tbeat": float(grid.tbeat),
-        "tbar": float(grid.tbar),
-        "tstep": float(grid.tstep),
-        "bar_start": _jsonable(grid.bar_start),
-        "t_step": _jsonable(grid.t_step),
-    }
+    grid_json = grid.as_json
 
     # 2) Skeleton Generation (Constraint)
     pools = {}
@@ -146,12 +160,12 @@ def main() -> None:
     skel_out = out_dir / f"skeleton_{ver}.json"
     
     # Write Grid
-    base_grid.write_text(json.dumps(grid_json, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_json(base_grid, grid_json)
     
     # Write Skeleton (as Reference)
     # We convert Event objects to list of dicts
-    skel_json = [_jsonable(e) for e in skel_events]
-    skel_out.write_text(json.dumps(skel_json, ensure_ascii=False, indent=2), encoding="utf-8")
+    skel_json = [_event_to_dict(e) for e in skel_events]
+    write_json(skel_out, skel_json)
 
     print("[DONE] Grid & Skeleton setup complete")
     print(f" - ID: {ver}")
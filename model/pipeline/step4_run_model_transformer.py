@@ -17,6 +17,10 @@ try:
     from model.stage4_model_gen.drums_transformer.inference import DrumsTransformerRunner
 except ImportError:
     from stage4_model_gen.drums_transformer.inference import DrumsTransformerRunner
+try:
+    from model.pipeline.json_io import write_json
+except ImportError:
+    from pipeline.json_io import write_json
 import pretty_midi
 
 logging.basicConfig(level=logging.INFO)
@@ -249,7 +253,7 @@ def main():
     # Output Final Result
     vid = 1
     out_events = out_dir / f"event_grid_transformer_{vid}.json"
-    out_events.write_text(json.dumps(final_events, indent=2, ensure_ascii=False))
+    write_json(out_events, final_events)
     
     # Also copy/rename the best MIDI for reference
     best_midi_src = best_cand[2]
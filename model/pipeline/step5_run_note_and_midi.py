@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import argparse
-import json
 from pathlib import Path
 from typing import Any, Dict
 import copy
@@ -16,6 +15,7 @@ from stage5_note_gen.sample_select import SampleSelector, SampleSelectorConfig
 from stage5_note_gen.normalize import load_note_list_json, normalize_notes_to_event_grid, dump_event_grid
 from stage5_note_gen.midi_export import export_event_grid_to_midi
 from stage5_note_gen.progressive import ProgressiveConfig, build_progressive_timeline
+from pipeline.json_io import write_json
 
 
 def parse_args() -> argparse.Namespace:
@@ -153,9 +153,7 @@ def main() -> None:
         
         # We also save the base loop for reference
         loop_ver = get_next_version(out_dir, prefix="event_grid_loop")
-        out_dir.joinpath(f"event_grid_loop_{loop_ver}.json").write_text(
-            json.dumps(dump_event_grid(base_loop_events), ensure_ascii=False, indent=2), encoding="utf-8"
-        )
+        write_json(out_dir / f"event_grid_loop_{loop_ver}.json", dump_event_grid(base_loop_events))
     else:
         # If disabled, final output is just the base loop
         print("[INFO] progressive=0, outputting 4-bar loop only.")
@@ -170,11 +168,11 @@ def main() -> None:
     meta_path = out_dir / f"note_meta_{ver}.json"
 
     # Save MAIN output
-    event_path.write_text(json.dumps(dump_event_grid(final_events), ensure_ascii=False, indent=2), encoding="utf-8")
+    write_json(event_path, dump_event_grid(final_events))
     
     # Also save the GRID logic (which might be expanded)
     grid_path = out_dir / f"grid_{ver}.json"
-    grid_path.write_text(json.dumps(dump_grid_json(final_grid), ensure_ascii=False, indent=2), encoding="utf-8")
+    write_json(grid_path, dump_grid_json(final_grid))
     
     export_event_grid_to_midi(final_grid, final_events, midi_path)
 
@@ -190,7 +188,7 @@ def main() -> None:
         "num_events": len(final_events),
         "progressive_info": final_meta,
     }
-    meta_path.write_text(json.dumps(base_meta_info, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_json(meta_path, base_meta_info)
 
     print("[DONE] stage5 finished")
     print(" - grid:", str(grid_path))
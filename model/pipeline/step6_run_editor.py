@@ -11,6 +11,8 @@ import sys
 # Add model dir to sys.path
 sys.path.append(str(Path(__file__).parent.parent))
 
+from pipeline.json_io import write_json
+
 
 # ----------------------------
 # Utilities
@@ -20,7 +22,7 @@ def load_json(path: Path) -> Any:
 
 
 def save_json(path: Path, obj: Any) -> None:
-    path.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_json(path, obj)
 
 
 def clamp(x: float, lo: float, hi: float) -> float:
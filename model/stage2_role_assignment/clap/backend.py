@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Tuple
 
 import numpy as np
 import torch
 import resampy
 from transformers import ClapModel, ClapProcessor
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class ClapBackendConfig:
@@ -16,6 +19,17 @@ class ClapBackendConfig:
     audio_pooling: str = "mean"  # mean | max (현재는 mean만 사용)
 
 
+def _from_pretrained(cls, model_id: str):
+    """
+    로컬 HF 캐시를 먼저 사용 (hub etag 확인 네트워크 왕복 생략),
+    캐시에 없을 때만 다운로드 경로로 fallback.
+    """
+    try:
+        return cls.from_pretrained(model_id, local_files_only=True)
+    except (OSError, ValueError):
+        return cls.from_pretrained(model_id)
+
+
 def _ensure_tensor(x: Any) -> torch.Tensor:
     """
     transformers output에서 torch.Tensor를 최대한 안정적으로 추출.
@@ -64,13 +78,16 @@ class ClapBackend:
         self.cfg = cfg
         self.device = self._pick_device(cfg.device)
 
-        self.processor = ClapProcessor.from_pretrained(cfg.model_id)
-        self.model = ClapModel.from_pretrained(cfg.model_id)
+        self.processor = _from_pretrained(ClapProcessor, cfg.model_id)
+        self.model = _from_pretrained(ClapModel, cfg.model_id)
         self.model.to(self.device)
         self.model.eval()
 
         self.embed_dim: Optional[int] = None
 
+        # 배치 임베딩이 클립 단위 임베딩과 같은지 (첫 배치에서 확인, None = 아직 모름)
+        self._batch_matches_single: Optional[bool] = None
+
         # CLAP feature extractor가 학습에 사용한 sampling rate (대부분 48000)
         fe = getattr(self.processor, "feature_extractor", None)
         self.target_sr = int(getattr(fe, "sampling_rate", 48000))
@@ -119,13 +136,9 @@ class ClapBackend:
 
         return text_features.detach().cpu().numpy().astype(np.float32, copy=False)
 
-    @torch.no_grad()
-    def embed_audio(self, y: np.ndarray, sr: int) -> np.ndarray:
+    def _prepare_audio(self, y: np.ndarray, sr: int) -> np.ndarray:
         """
-        audio -> (D,) numpy float32 (L2 normalized)
-        - CLAP 요구 SR로 강제 리샘플
-        - processor 키워드 호환(audio / audios)
-        - 오디오 전용 API(get_audio_features) 사용
+        mono float32 + CLAP 요구 SR로 강제 리샘플
         """
         if y is None:
             raise ValueError("embed_audio: y is None")
@@ -140,20 +153,28 @@ class ClapBackend:
         # 48k 강제 리샘플
         if int(sr) != int(self.target_sr):
             y = resampy.resample(y, int(sr), int(self.target_sr)).astype(np.float32, copy=False)
-            sr = int(self.target_sr)
+        return y
+
+    def _audio_features(self, ys: List[np.ndarray]) -> torch.Tensor:
+        """
+        target_sr로 맞춘 오디오 리스트 -> (N, D) L2 normalized tensor
+        주의: fusion 모델은 feature extractor가 배치 전체에서 is_longer를 하나만 랜덤으로 켜므로
+        배치 결과가 클립 단위 결과와 다를 수 있음 (embed_audio_batch에서 확인)
+        """
+        audio = ys[0] if len(ys) == 1 else ys
 
         # processor 버전 호환
         try:
             inputs = self.processor(
-                audio=y,
-                sampling_rate=int(sr),
+                audio=audio,
+                sampling_rate=int(self.target_sr),
                 return_tensors="pt",
                 padding=True,
             )
         except (TypeError, ValueError):
             inputs = self.processor(
-                audios=y,
-                sampling_rate=int(sr),
+                audios=audio,
+                sampling_rate=int(self.target_sr),
                 return_tensors="pt",
                 padding=True,
             )
@@ -164,19 +185,63 @@ class ClapBackend:
         out = self.model.get_audio_features(**inputs)
         audio_features = _ensure_tensor(out)
         audio_features = self._pool_if_3d(audio_features)
-
-        # 혹시 batch가 여러 개면 첫 개만
-        if audio_features.ndim == 2 and audio_features.shape[0] > 1:
-            audio_features = audio_features[:1]
-
         audio_features = self._l2_normalize(audio_features)
 
         if self.embed_dim is None:
             self.embed_dim = int(audio_features.shape[-1])
 
-        # (1,D) -> (D,)
+        return audio_features
+
+    @torch.no_grad()
+    def embed_audio(self, y: np.ndarray, sr: int) -> np.ndarray:
+        """
+        audio -> (D,) numpy float32 (L2 normalized)
+        - CLAP 요구 SR로 강제 리샘플
+        - processor 키워드 호환(audio / audios)
+        - 오디오 전용 API(get_audio_features) 사용
+        """
+        audio_features = self._audio_features([self._prepare_audio(y, sr)])
+
+        # (1,D) -> (D,)  (혹시 batch가 여러 개면 첫 개만)
         return audio_features[0].detach().cpu().numpy().astype(np.float32, copy=False)
 
+    @torch.no_grad()
+    def embed_audio_batch(self, items: List[Tuple[np.ndarray, int]]) -> np.ndarray:
+        """
+        [(y, sr), ...] -> (N, D) numpy float32 (L2 normalized)
+        forward 한 번으로 N개를 임베딩 (GPU에서 클립당 kernel launch/전송 비용 절감).
+        첫 배치는 클립 단위 결과와 np.allclose로 비교하고, 다르면 (fusion 모델의 is_longer 등)
+        이후로는 클립 단위로 임베딩.
+        """
+        if not items:
+            raise ValueError("embed_audio_batch: items is empty")
+
+        ys = [self._prepare_audio(y, sr) for y, sr in items]
+        if len(ys) == 1 or self._batch_matches_single is False:
+            return self._embed_each(ys)
+
+        audio_features = self._audio_features(ys)
+        if audio_features.ndim != 2 or audio_features.shape[0] != len(items):
+            raise ValueError(f"embed_audio_batch: expected ({len(items)}, D), got {tuple(audio_features.shape)}")
+        batched = audio_features.detach().cpu().numpy().astype(np.float32, copy=False)
+
+        if self._batch_matches_single is None:
+            single = self._embed_each(ys)
+            self._batch_matches_single = bool(np.allclose(batched, single, atol=1e-4))
+            if not self._batch_matches_single:
+                logger.warning(
+                    "CLAP batched audio embeddings differ from per-clip ones for %s; embedding clips one at a time",
+                    self.cfg.model_id,
+                )
+                return single
+        return batched
+
+    def _embed_each(self, ys: List[np.ndarray]) -> np.ndarray:
+        # (N, D): 클립마다 forward 한 번 (embed_audio와 같은 경로)
+        return np.stack([
+            self._audio_features([y])[0].detach().cpu().numpy().astype(np.float32, copy=False) for y in ys
+        ])
+
     @staticmethod
     def cosine_sim(a: np.ndarray, b: np.ndarray) -> float:
         """
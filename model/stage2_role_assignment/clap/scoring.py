@@ -149,7 +149,6 @@ class ClapScorer:
     def _cache_path(self, role: str, group: str, texts: List[str]) -> Optional[str]:
         if not self.cfg.cache_dir:
             return None
-        os.makedirs(self.cfg.cache_dir, exist_ok=True)
         key = {
             "ver": self.cfg.cache_version,
             "model": getattr(getattr(self.backend, "cfg", None), "model_id", "unknown"),
@@ -166,10 +165,13 @@ class ClapScorer:
             raise ValueError(f"empty texts for role={role}, group={group}")
 
         p = self._cache_path(role, group, texts)
-        if p and os.path.exists(p):
-            arr = np.load(p)
-            arr = _l2norm_np(arr.astype(np.float32, copy=False))
-            return arr
+        if p:
+            try:
+                arr = np.load(p)
+            except (FileNotFoundError, ValueError, EOFError):
+                pass
+            else:
+                return _l2norm_np(arr.astype(np.float32, copy=False))
 
         emb = self.backend.embed_text(texts)  # (P,D)
         emb = np.asarray(emb, dtype=np.float32)
@@ -183,12 +185,25 @@ class ClapScorer:
         emb = _l2norm_np(emb)
 
         if p:
-            np.save(p, emb)
+            # 동시에 도는 step2 프로세스가 쓰다 만 .npy를 읽지 않도록 tmp에 쓰고 교체
+            tmp = f"{p}.{os.getpid()}.tmp"
+            try:
+                with open(tmp, "wb") as f:
+                    np.save(f, emb)
+                os.replace(tmp, p)
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
         return emb
 
     def _prepare_text_embeddings(self) -> None:
         roles_block = self.prompts.get("roles", {})
         self.text_embeds = {}
+        if self.cfg.cache_dir:
+            os.makedirs(self.cfg.cache_dir, exist_ok=True)
 
         for role in self.roles:
             block = roles_block.get(role, {}) if isinstance(roles_block, dict) else {}
@@ -241,7 +256,12 @@ class ClapScorer:
             raise ValueError(f"Unknown ensemble_method: {method}")
 
     def score(self, y: np.ndarray, sr: int) -> Tuple[Dict[str, float], ClapScoreProbs]:
-        a = self.backend.embed_audio(y, sr)
+        return self.score_embedding(self.backend.embed_audio(y, sr))
+
+    def score_embedding(self, a: np.ndarray) -> Tuple[Dict[str, float], ClapScoreProbs]:
+        """
+        이미 계산된 오디오 임베딩 (D,)으로 점수 계산 (embed_audio_batch 결과의 한 행)
+        """
         a = np.asarray(a, dtype=np.float32).reshape(-1)
 
         # 역할별 "로그릿/유사도" 계산
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Deque, Iterator, List, Optional, Sequence, Tuple
 
 import numpy as np
 
-from .types import Role, SampleResult, ScoreBundle
+from .types import DSPFeatures, Role, SampleResult, ScoreBundle
 from .dsp.audio_io import AudioLoadConfig, load_audio
 from .dsp.features import DSPConfig, extract_features
 from .dsp.rule_scoring import RuleScoringConfig, compute_rule_scores
@@ -52,21 +55,85 @@ class RoleAssigner:
 
         return self.assign_audio(y=y, sr=sr, sample_id=sid, filepath=str(path))
 
+    def assign_files(
+        self,
+        filepaths: Sequence[str | Path],
+        max_workers: Optional[int] = None,
+        batch_size: int = 8,
+    ) -> Iterator[SampleResult]:
+        """
+        여러 파일을 입력 순서대로 처리.
+        디코드/리샘플 + DSP 특징 추출(librosa/numpy, GIL 해제)은 스레드 풀에서 미리 돌리고
+        CLAP 임베딩은 batch_size개씩 묶어서 forward 한 번,
+        점수 계산은 현재 스레드에서 순차 실행 (모델 동시 접근 방지)
+        """
+        paths: List[Path] = [Path(p) for p in filepaths]
+        if not paths:
+            return
+        batch_size = max(1, int(batch_size))
+        # 디코드된 오디오가 업로드 전체만큼 쌓이지 않도록 CLAP 배치 2개 분량만 미리 로드
+        prefetch = 2 * batch_size
+        workers = max_workers or min(len(paths), prefetch, os.cpu_count() or 4)
+
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            todo = iter(paths)
+            pending: Deque[Tuple[Path, Future]] = deque()
+
+            def refill() -> None:
+                while len(pending) < prefetch:
+                    path = next(todo, None)
+                    if path is None:
+                        return
+                    pending.append((path, ex.submit(self._load_features, path)))
+
+            try:
+                refill()
+                batch: List[Tuple[Path, np.ndarray, int, DSPFeatures]] = []
+                while pending:
+                    path, fut = pending.popleft()
+                    y, sr, feats = fut.result()
+                    batch.append((path, y, sr, feats))
+                    if len(batch) >= batch_size or not pending:
+                        yield from self._assign_batch(batch)
+                        batch = []
+                        refill()
+            finally:
+                # 중간에 멈추면(예외/generator close) 아직 안 돈 로드는 취소
+                for _, fut in pending:
+                    fut.cancel()
+
+    def _load_features(self, path: Path) -> Tuple[np.ndarray, int, DSPFeatures]:
+        # 워커 스레드에서 실행: 모델을 건드리지 않는 I/O + DSP만
+        y, sr = load_audio(path, self.cfg.audio)
+        return y, sr, extract_features(y, sr, self.cfg.dsp)
+
+    def _assign_batch(self, batch: List[Tuple[Path, np.ndarray, int, DSPFeatures]]) -> Iterator[SampleResult]:
+        embeds = self.clap_backend.embed_audio_batch([(y, sr) for _, y, sr, _ in batch])
+        for (path, y, sr, feats), a in zip(batch, embeds):
+            yield self.assign_audio(
+                y=y, sr=sr, sample_id=path.stem, filepath=str(path), audio_embed=a, features=feats
+            )
+
     def assign_audio(
         self,
         y: np.ndarray,
         sr: int,
         sample_id: str = "sample",
         filepath: str = "",
+        audio_embed: Optional[np.ndarray] = None,
+        features: Optional[DSPFeatures] = None,
     ) -> SampleResult:
         # 1) DSP features
-        feats = extract_features(y, sr, self.cfg.dsp)
+        feats = features if features is not None else extract_features(y, sr, self.cfg.dsp)
 
         # 2) rule score -> p_rule
         rule_raw, p_rule = compute_rule_scores(feats, self.cfg.rule_scoring)
 
         # 3) CLAP similarity -> p_clap
-        sim_role, p_clap = self.clap_scorer.score(y, sr)
+        if audio_embed is None:
+            sim_role, p_clap = self.clap_scorer.score(y, sr)
+        else:
+            sim_role, p_clap = self.clap_scorer.score_embedding(audio_embed)
 
         # 4) fuse -> p_final + confidence
         p_final, margin = fuse_rule_and_clap(
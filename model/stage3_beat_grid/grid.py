@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List
+from functools import cached_property
+from typing import Any, Dict, List
 
 
 @dataclass(frozen=True)
@@ -23,6 +24,22 @@ class GridTime:
     bar_start: List[float]
     t_step: List[List[float]]  # [bar][step] -> time(sec)
 
+    @cached_property
+    def as_json(self) -> Dict[str, Any]:
+        # grid_*.json 형태. frozen이라 값이 바뀌지 않으니 한 번만 만들어 재사용
+        return {
+            "bpm": float(self.cfg.bpm),
+            "meter": f"{int(self.cfg.meter_numer)}/{int(self.cfg.meter_denom)}",
+            "steps_per_bar": int(self.cfg.steps_per_bar),
+            "num_bars": int(self.cfg.num_bars),
+            "tbeat": float(self.tbeat),
+            "tbar": float(self.tbar),
+            "tstep": float(self.tstep),
+            # build_grid already returns plain float lists; json handles them as-is
+            "bar_start": self.bar_start,
+            "t_step": self.t_step,
+        }
+
 
 def build_grid(cfg: GridConfig) -> GridTime:
     if cfg.bpm <= 0:
@@ -34,13 +51,8 @@ def build_grid(cfg: GridConfig) -> GridTime:
     tstep = tbar / float(cfg.steps_per_bar)
 
     bar_start = [b * tbar for b in range(cfg.num_bars)]
-    t_step: List[List[float]] = []
-    for b in range(cfg.num_bars):
-        row = []
-        base = bar_start[b]
-        for k in range(cfg.steps_per_bar):
-            row.append(base + k * tstep)
-        t_step.append(row)
+    step_offsets = [k * tstep for k in range(cfg.steps_per_bar)]
+    t_step: List[List[float]] = [[base + off for off in step_offsets] for base in bar_start]
 
     return GridTime(
         cfg=cfg,
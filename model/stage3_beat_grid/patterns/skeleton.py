@@ -159,40 +159,32 @@ def build_skeleton_events(
         feats = core_sample.get("features", {})
         decay = feats.get("decay_time", None)
         dur = dur_from_decay(decay, tstep, "CORE")
+        # bar/step과 무관한 값은 루프 밖에서 한 번만 (vel_from_energy는 CORE에서 rng를 쓰지 않음)
+        vel = vel_from_energy("CORE", feats.get("energy", None), rng)
+        sid = str(core_sample["sample_id"])
+        steps = [int(s) % cfg.steps_per_bar for s in core_steps]
 
-        for b in range(cfg.num_bars):
-            for s in core_steps:
-                e = feats.get("energy", None)
-                events.append(
-                    Event(
-                        bar=b,
-                        step=int(s) % cfg.steps_per_bar,
-                        role="CORE",
-                        sample_id=str(core_sample["sample_id"]),
-                        vel=vel_from_energy("CORE", e, rng),
-                        dur_steps=dur,
-                    )
-                )
+        events.extend(
+            Event(bar=b, step=s, role="CORE", sample_id=sid, vel=vel, dur_steps=dur)
+            for b in range(cfg.num_bars)
+            for s in steps
+        )
 
     # ---- ACCENT
     if accent_sample:
         feats = accent_sample.get("features", {})
         decay = feats.get("decay_time", None)
         dur = dur_from_decay(decay, tstep, "ACCENT")
-
-        for b in range(cfg.num_bars):
-            for s in accent_steps:
-                e = feats.get("energy", None)
-                events.append(
-                    Event(
-                        bar=b,
-                        step=int(s) % cfg.steps_per_bar,
-                        role="ACCENT",
-                        sample_id=str(accent_sample["sample_id"]),
-                        vel=vel_from_energy("ACCENT", e, rng),
-                        dur_steps=dur,
-                    )
-                )
+        # bar/step과 무관한 값은 루프 밖에서 한 번만 (vel_from_energy는 ACCENT에서 rng를 쓰지 않음)
+        vel = vel_from_energy("ACCENT", feats.get("energy", None), rng)
+        sid = str(accent_sample["sample_id"])
+        steps = [int(s) % cfg.steps_per_bar for s in accent_steps]
+
+        events.extend(
+            Event(bar=b, step=s, role="ACCENT", sample_id=sid, vel=vel, dur_steps=dur)
+            for b in range(cfg.num_bars)
+            for s in steps
+        )
 
     # ---- MOTION
     motion_steps_A = tuple(range(0, cfg.steps_per_bar))          # 0..15
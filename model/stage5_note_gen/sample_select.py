@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Optional
 import random
 
 from .pools_io import extract_sample_ids_for_role
@@ -21,10 +21,15 @@ class SampleSelector:
         self.rng = random.Random(int(cfg.seed))
         self._rr_idx: Dict[str, int] = {}
         self._fixed: Dict[str, str] = {}
+        # role -> sample_id 리스트 (pool 항목의 str/dict 정규화는 role마다 한 번만)
+        self._ids: Dict[str, List[str]] = {}
+        self._id_to_path: Optional[Dict[str, Optional[str]]] = None
 
     def pick(self, role: str) -> str:
         role_u = role.upper()
-        ids: List[str] = extract_sample_ids_for_role(self.pools, role_u)
+        ids = self._ids.get(role_u)
+        if ids is None:
+            ids = self._ids[role_u] = extract_sample_ids_for_role(self.pools, role_u)
         if not ids:
             return f"__MISSING__{role_u}"
 
@@ -43,28 +48,25 @@ class SampleSelector:
         return sid
 
     def get_filepath(self, sample_id: str) -> Optional[str]:
-        # DEBUG: Print structure for first call or specific ID
-        debug = (sample_id == "drums")
-        
-        for pool_key, pool_data in self.pools.items():
-             if isinstance(pool_data, list):
-                 if debug: print(f"[DEBUG] Checking pool list {pool_key} (len={len(pool_data)})...")
-                 for s in pool_data:
-                     if isinstance(s, dict):
-                         sid = str(s.get("sample_id"))
-                         if debug: print(f"[DEBUG]   Compare '{sid}' vs '{sample_id}'")
-                         if sid == str(sample_id):
-                             fp = s.get("filepath")
-                             if debug: print(f"[DEBUG]   MATCH! filepath={fp}")
-                             return fp
-             elif isinstance(pool_data, dict):
-                 if debug: print(f"[DEBUG] Checking pool dict {pool_key}...")
-                 samples = pool_data.get("samples", [])
-                 if isinstance(samples, list):
-                     for s in samples:
-                         if isinstance(s, dict):
-                             sid = str(s.get("sample_id"))
-                             if sid == str(sample_id):
-                                 return s.get("filepath")
-        if debug: print(f"[DEBUG] Failed to find filepath for {sample_id}")
-        return None
\ No newline at end of file
+        # 노트마다 pool 전체를 훑지 않도록 sample_id -> filepath 맵을 처음 한 번만 만듦
+        if self._id_to_path is None:
+            self._id_to_path = _build_id_to_path(self.pools)
+        return self._id_to_path.get(str(sample_id))
+
+
+def _build_id_to_path(pools: Dict) -> Dict[str, Optional[str]]:
+    """pool 순서대로 훑어서 처음 나온 sample_id 의 filepath 를 사용 (기존 선형 탐색과 같은 결과)."""
+    id_to_path: Dict[str, Optional[str]] = {}
+    for pool_data in pools.values():
+        if isinstance(pool_data, list):
+            samples = pool_data
+        elif isinstance(pool_data, dict):
+            samples = pool_data.get("samples", [])
+            if not isinstance(samples, list):
+                continue
+        else:
+            continue
+        for s in samples:
+            if isinstance(s, dict):
+                id_to_path.setdefault(str(s.get("sample_id")), s.get("filepath"))
+    return id_to_path